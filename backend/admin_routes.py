@@ -2,18 +2,114 @@
 Admin routes for Local Crust Bakery
 Handles admin authentication and administrative functions
 """
-from flask import Blueprint, request, jsonify
-from werkzeug.security import generate_password_hash, check_password_hash
+from flask import Blueprint, request
+from werkzeug.exceptions import HTTPException
 from datetime import datetime, timedelta
+import os
 import jwt
+import time
+import hmac
+import hashlib
+import threading
 from functools import wraps
-from database import db, Admin, User, Baker, Product, Order, Review, Payment, OrderItem
-from sqlalchemy import func, desc
+from cachetools import TTLCache
+from orjson_response import orjson_response, orjson_stream_response, orjson_dumps, json_bytes_response, get_json_body
+from cache_service import cache_get, cache_set, invalidate_on_commit, invalidate_models
+from baker_service import forget_baker_id
+from product_service import forget_product_cards
+from schemas import UserCreate, BakerCreate, ValidationError, validation_message
+from password_service import hash_password, verify_password, needs_rehash
+from database import db, Admin, User, Baker, Product, Order, Review, Payment, OrderItem, Wishlist, Notification, Badge, LoyaltyPoints
+from sqlalchemy import func, desc, delete, update, select, case, distinct, tuple_, true
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, selectinload, load_only
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/api/admin')
 
 SECRET_KEY = 'your-secret-key-change-in-production'
 
+# Encode the HMAC key once and reuse a single PyJWT instance and algorithms
+# list instead of rebuilding them on every encode/decode
+_JWT_KEY = SECRET_KEY.encode('utf-8')
+_JWT_ALGORITHM = 'HS256'
+_JWT_ALGORITHMS = [_JWT_ALGORITHM]
+_jwt = jwt.PyJWT()
+
+# Recently verified admin tokens, keyed by SHA-256 of the token so raw tokens
+# are not kept in memory -> {'admin_id', 'role', 'exp', 'checked_at'}. A hit
+# skips the signature check; the Admin is_active lookup is only repeated once
+# ADMIN_RECHECK_INTERVAL seconds have passed, so a deactivated admin keeps
+# access for at most that long. Failed validations are never cached.
+TOKEN_CACHE_TTL = 3600
+ADMIN_RECHECK_INTERVAL = 60
+_token_cache = TTLCache(maxsize=10000, ttl=TOKEN_CACHE_TTL)
+_token_cache_lock = threading.Lock()
+
+# Opt-in cache of recently verified admin logins, so repeated logins within
+# LOGIN_CACHE_TTL seconds skip the password KDF. Entries are an HMAC of the
+# stored hash and the password under a per-process secret, so a password
+# change or rehash invalidates them.
+USE_VERIFY_PASSWORD_CACHE = os.getenv('USE_VERIFY_PASSWORD_CACHE', '').lower() in ('1', 'true', 'yes')
+LOGIN_CACHE_TTL = 300
+_login_cache = TTLCache(maxsize=1024, ttl=LOGIN_CACHE_TTL)
+_login_cache_lock = threading.Lock()
+_login_cache_secret = os.urandom(32)
+
+def _login_cache_key(password_hash, password):
+    return hmac.new(
+        _login_cache_secret,
+        f'{password_hash}\0{password}'.encode('utf-8'),
+        hashlib.sha256
+    ).digest()
+
+# Dashboard stats are polled by every open admin tab; serve them from cache.
+DASHBOARD_STATS_KEY = 'admin:dashboard:v1'
+DASHBOARD_STATS_TTL = 15
+
+# The sales report is dropped when its orders, items, products or bakers
+# change. The TTL stays short because that only reaches other workers when
+# the cache is Redis, and a report computed before a commit can still be
+# stored after it
+SALES_REPORT_KEY = 'admin:sales-report:v1'
+SALES_REPORT_TTL = 60
+
+# Drop cached responses once a commit touches the models they are built from
+invalidate_on_commit(DASHBOARD_STATS_KEY, User, Baker, Product, Order)
+invalidate_on_commit(SALES_REPORT_KEY, Baker, Product, Order, OrderItem)
+
+# Rows fetched per round-trip while streaming admin listings
+STREAM_BATCH_SIZE = 500
+
+def page_cursor(created_at, row_id):
+    """Cursor for the page after a row; the id breaks created_at ties"""
+    return f'{created_at.isoformat()}_{row_id}'
+
+def parse_limit(value):
+    """
+    Parse a ?limit= page size
+
+    Returns:
+        int of at least 1, or None if the value is malformed or below 1
+    """
+    try:
+        limit = int(value)
+    except ValueError:
+        return None
+    return limit if limit >= 1 else None
+
+def parse_cursor(cursor):
+    """
+    Parse a page_cursor value
+
+    Returns:
+        (created_at, id) tuple, or None if the cursor is malformed
+    """
+    created_at, _, row_id = cursor.rpartition('_')
+    try:
+        return datetime.fromisoformat(created_at), int(row_id)
+    except ValueError:
+        return None
+
 # Decorator to require admin authentication
 def admin_required(f):
     @wraps(f)
@@ -21,210 +117,404 @@ def admin_required(f):
         token = request.headers.get('Authorization')
         
         if not token:
-            return jsonify({'error': 'No token provided'}), 401
+            return orjson_response({'error': 'No token provided'}, 401)
+        
+        # Remove 'Bearer ' prefix if present
+        if token.startswith('Bearer '):
+            token = token[7:]
+        
+        cache_key = hashlib.sha256(token.encode('utf-8')).digest()
+        with _token_cache_lock:
+            cached = _token_cache.get(cache_key)
+        
+        if cached:
+            now = time.time()
+            if cached['exp'] <= now:
+                with _token_cache_lock:
+                    _token_cache.pop(cache_key, None)
+                return orjson_response({'error': 'Token expired'}, 401)
+            
+            # Signature is known good; only re-check the account periodically
+            if now - cached['checked_at'] >= ADMIN_RECHECK_INTERVAL:
+                admin = db.session.get(
+                    Admin, cached['admin_id'],
+                    options=[load_only(Admin.id, Admin.is_active)]
+                )
+                if not admin or not admin.is_active:
+                    with _token_cache_lock:
+                        _token_cache.pop(cache_key, None)
+                    return orjson_response({'error': 'Admin account inactive'}, 403)
+                cached['checked_at'] = now
+            
+            request.admin_id = cached['admin_id']
+            request.admin_role = cached['role']
+            return f(*args, **kwargs)
         
         try:
-            # Remove 'Bearer ' prefix if present
-            if token.startswith('Bearer '):
-                token = token[7:]
-            
-            payload = jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
+            payload = _jwt.decode(token, _JWT_KEY, algorithms=_JWT_ALGORITHMS)
             
             if payload.get('user_type') != 'admin':
-                return jsonify({'error': 'Admin access required'}), 403
+                return orjson_response({'error': 'Admin access required'}, 403)
             
-            # Get admin and check if active
-            admin = Admin.query.get(payload['admin_id'])
+            # Get admin and check if active; only the columns needed here
+            admin = db.session.get(
+                Admin, payload['admin_id'],
+                options=[load_only(Admin.id, Admin.is_active)]
+            )
             if not admin or not admin.is_active:
-                return jsonify({'error': 'Admin account inactive'}), 403
+                return orjson_response({'error': 'Admin account inactive'}, 403)
             
-            request.admin = admin
+            with _token_cache_lock:
+                _token_cache[cache_key] = {
+                    'admin_id': admin.id,
+                    'role': payload.get('role'),
+                    'exp': payload['exp'],
+                    'checked_at': time.time()
+                }
+            
+            request.admin_id = admin.id
+            request.admin_role = payload.get('role')
             
         except jwt.ExpiredSignatureError:
-            return jsonify({'error': 'Token expired'}), 401
+            return orjson_response({'error': 'Token expired'}, 401)
         except jwt.InvalidTokenError:
-            return jsonify({'error': 'Invalid token'}), 401
+            return orjson_response({'error': 'Invalid token'}, 401)
         
         return f(*args, **kwargs)
     
     return decorated_function
 
+# Optional LIMIT+1 paging for list endpoints
+def paginate_query(query):
+    """
+    Apply optional ?page=&per_page= paging to a query. One extra row is
+    fetched to tell whether a next page exists, so no COUNT query is needed.
+    
+    Returns:
+        tuple: (items, has_next, current_page); items is a list when paged
+        and a lazy iterator otherwise
+    """
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = request.args.get('per_page', type=int)
+    
+    if not per_page:
+        # Unpaged: hand back a lazy batched iterator for streaming responses
+        return query.yield_per(STREAM_BATCH_SIZE), False, page
+    
+    items = query.offset((page - 1) * per_page).limit(per_page + 1).all()
+    return items[:per_page], len(items) > per_page, page
+
+def product_count_column():
+    """Number of products per baker, correlated to the outer Baker query"""
+    return db.session.query(func.count(Product.id)).filter(
+        Product.baker_id == Baker.id
+    ).correlate(Baker).scalar_subquery().label('product_count')
+
+def baker_listing_query():
+    """Plain columns for the admin baker listings, with owner email and product count"""
+    return db.session.query(
+        Baker.id,
+        Baker.shop_name,
+        Baker.owner_name,
+        Baker.phone,
+        Baker.city,
+        Baker.state,
+        Baker.business_license,
+        Baker.tax_id,
+        Baker.shop_description,
+        Baker.verified,
+        User.email.label('user_email'),
+        product_count_column()
+    ).outerjoin(User, Baker.user_id == User.id)
+
+def baker_row(row):
+    """Serialize a baker_listing_query row"""
+    return {
+        'id': str(row.id),
+        'shop_name': row.shop_name,
+        'owner_name': row.owner_name,
+        'phone': row.phone,
+        'city': row.city,
+        'state': row.state,
+        'business_license': row.business_license,
+        'tax_id': row.tax_id,
+        'shop_description': row.shop_description,
+        'verified': row.verified,
+        'user_email': row.user_email,
+        'product_count': row.product_count
+    }
+
+def delete_user_rows(user_id):
+    """
+    Remove a user account and the rows that belong to it, so nothing is left
+    pointing at a user id SQLite may hand to the next registration. Orders
+    are not touched; callers refuse to delete users who have any
+    """
+    options = {'synchronize_session': False}
+    # Other users' notifications about this user's reviews lose the link
+    db.session.execute(
+        update(Notification).where(
+            Notification.related_review_id.in_(select(Review.id).where(Review.user_id == user_id))
+        ).values(related_review_id=None),
+        execution_options=options
+    )
+    for model in (Notification, Badge, LoyaltyPoints, Wishlist, Review):
+        db.session.execute(delete(model).where(model.user_id == user_id), execution_options=options)
+    db.session.execute(delete(User).where(User.id == user_id), execution_options=options)
+
+def delete_baker_rows(baker_id, user_id):
+    """
+    Remove a baker, their products and reviews, and their user account with
+    set-based DELETEs instead of loading every child row for the ORM cascade
+
+    Returns:
+        list of the deleted product ids
+    """
+    options = {'synchronize_session': False}
+    db.session.execute(
+        update(Notification).where(
+            Notification.related_review_id.in_(select(Review.id).where(Review.baker_id == baker_id))
+        ).values(related_review_id=None),
+        execution_options=options
+    )
+    db.session.execute(delete(Review).where(Review.baker_id == baker_id), execution_options=options)
+    product_ids = db.session.scalars(
+        delete(Product).where(Product.baker_id == baker_id).returning(Product.id),
+        execution_options=options
+    ).all()
+    db.session.execute(delete(Baker).where(Baker.id == baker_id), execution_options=options)
+    delete_user_rows(user_id)
+    return product_ids
+
+@admin_bp.errorhandler(Exception)
+def handle_unexpected_error(e):
+    """Return unexpected errors from admin routes as JSON, rolling back the session"""
+    if isinstance(e, HTTPException):
+        return e
+    db.session.rollback()
+    return orjson_response({'error': str(e)}, 500)
+
 # Admin Authentication Routes
 @admin_bp.route('/login', methods=['POST'])
 def admin_login():
     """Admin login endpoint"""
-    try:
-        data = request.get_json()
-        
-        # Validate required fields
-        if not data.get('username') or not data.get('password'):
-            return jsonify({'error': 'Username and password required'}), 400
-        
-        # Find admin
-        admin = Admin.query.filter_by(username=data['username']).first()
-        
-        if not admin:
-            return jsonify({'error': 'Invalid credentials'}), 401
-        
-        # Check if admin is active
-        if not admin.is_active:
-            return jsonify({'error': 'Admin account is inactive'}), 403
-        
-        # Verify password
-        if not check_password_hash(admin.password_hash, data['password']):
-            return jsonify({'error': 'Invalid credentials'}), 401
-        
-        # Update last login
-        admin.last_login = datetime.utcnow()
-        db.session.commit()
-        
-        # Create token
-        payload = {
-            'admin_id': admin.id,
-            'user_type': 'admin',
-            'role': admin.role,
-            'exp': datetime.utcnow() + timedelta(days=1)
-        }
-        token = jwt.encode(payload, SECRET_KEY, algorithm='HS256')
-        
-        return jsonify({
-            'message': 'Login successful',
-            'token': token,
-            'admin': {
-                'id': admin.id,
-                'username': admin.username,
-                'email': admin.email,
-                'full_name': admin.full_name,
-                'role': admin.role
-            }
-        }), 200
-        
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    data = get_json_body()
+    
+    # Validate required fields
+    if not data.get('username') or not data.get('password'):
+        return orjson_response({'error': 'Username and password required'}, 400)
+    
+    # Find admin
+    admin = Admin.query.filter_by(username=data['username']).first()
+    
+    if not admin:
+        return orjson_response({'error': 'Invalid credentials'}, 401)
+    
+    # Check if admin is active
+    if not admin.is_active:
+        return orjson_response({'error': 'Admin account is inactive'}, 403)
+    
+    # Verify password, unless this exact credential was verified recently
+    verified = False
+    if USE_VERIFY_PASSWORD_CACHE:
+        with _login_cache_lock:
+            verified = _login_cache_key(admin.password_hash, data['password']) in _login_cache
+    
+    if not verified and not verify_password(admin.password_hash, data['password']):
+        return orjson_response({'error': 'Invalid credentials'}, 401)
+    
+    # Update last login
+    values = {'last_login': datetime.utcnow()}
+    
+    # Upgrade legacy or outdated hashes while we have the plain password
+    if needs_rehash(admin.password_hash):
+        values['password_hash'] = hash_password(data['password'])
+    
+    if USE_VERIFY_PASSWORD_CACHE:
+        stored_hash = values.get('password_hash', admin.password_hash)
+        with _login_cache_lock:
+            _login_cache[_login_cache_key(stored_hash, data['password'])] = True
+    
+    # Create token
+    payload = {
+        'admin_id': admin.id,
+        'user_type': 'admin',
+        'role': admin.role,
+        'exp': datetime.utcnow() + timedelta(days=1)
+    }
+    token = _jwt.encode(payload, _JWT_KEY, algorithm=_JWT_ALGORITHM)
+    
+    # Built before the commit, which expires the instance and would
+    # otherwise re-SELECT it just to read these fields back
+    admin_data = {
+        'id': admin.id,
+        'username': admin.username,
+        'email': admin.email,
+        'full_name': admin.full_name,
+        'role': admin.role
+    }
+    
+    # Single UPDATE instead of flushing the ORM instance
+    db.session.execute(
+        update(Admin).where(Admin.id == admin.id).values(**values),
+        execution_options={'synchronize_session': False}
+    )
+    db.session.commit()
+    
+    return orjson_response({
+        'message': 'Login successful',
+        'token': token,
+        'admin': admin_data
+    }, 200)
 
 @admin_bp.route('/profile', methods=['GET'])
 @admin_required
 def get_admin_profile():
     """Get current admin profile"""
-    admin = request.admin
-    return jsonify({
+    admin = db.session.get(Admin, request.admin_id)
+    if not admin:
+        return orjson_response({'error': 'Admin not found'}, 404)
+
+    return orjson_response({
         'id': admin.id,
         'username': admin.username,
         'email': admin.email,
         'full_name': admin.full_name,
         'role': admin.role,
-        'created_at': admin.created_at.isoformat(),
-        'last_login': admin.last_login.isoformat() if admin.last_login else None
-    }), 200
+        'created_at': admin.created_at,
+        'last_login': admin.last_login
+    }, 200)
 
 # Dashboard Statistics
 @admin_bp.route('/stats', methods=['GET'])
 @admin_required
 def get_dashboard_stats():
     """Get dashboard statistics"""
-    try:
-        # Total counts
-        total_users = User.query.filter_by(user_type='customer').count()
-        total_bakers = Baker.query.count()
-        total_products = Product.query.count()
-        total_orders = Order.query.count()
-        
-        # Verified vs unverified bakers
-        verified_bakers = Baker.query.filter_by(verified=True).count()
-        pending_bakers = Baker.query.filter_by(verified=False).count()
-        
-        # Revenue calculation
-        completed_orders = Order.query.filter_by(payment_status='completed').all()
-        total_revenue = sum(order.total_amount for order in completed_orders)
-        
-        # Pending orders count
-        pending_orders = Order.query.filter_by(status='pending').count()
-        
-        return jsonify({
-            'total_users': total_users,
-            'total_bakers': total_bakers,
-            'verified_bakers': verified_bakers,
-            'pending_bakers': pending_bakers,
-            'total_products': total_products,
-            'total_orders': total_orders,
-            'pending_orders': pending_orders,
-            'total_revenue': total_revenue
-        }), 200
-        
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    cached = cache_get(DASHBOARD_STATS_KEY)
+    if cached:
+        return json_bytes_response(cached, 200)
+    
+    # Baker totals from one scan: COUNT plus a conditional SUM for verified
+    baker_counts = db.session.query(
+        func.count(Baker.id).label('total'),
+        func.coalesce(func.sum(case((Baker.verified == True, 1), else_=0)), 0).label('verified')
+    ).subquery()
+    
+    # Order total, pending count and completed revenue from one scan
+    order_counts = db.session.query(
+        func.count(Order.id).label('total'),
+        func.coalesce(func.sum(case((Order.status == 'pending', 1), else_=0)), 0).label('pending'),
+        func.coalesce(func.sum(case(
+            (Order.payment_status == 'completed', Order.total_amount), else_=0.0
+        )), 0.0).label('revenue')
+    ).subquery()
+    
+    # All counters come back from a single round-trip; both subqueries are
+    # one row, so they are joined explicitly on true
+    counts = db.session.query(
+        db.session.query(func.count(User.id)).filter(User.user_type == 'customer').scalar_subquery().label('users'),
+        baker_counts.c.total.label('bakers'),
+        baker_counts.c.verified.label('verified'),
+        db.session.query(func.count(Product.id)).scalar_subquery().label('products'),
+        order_counts.c.total.label('orders'),
+        order_counts.c.pending.label('pending_orders'),
+        order_counts.c.revenue.label('revenue')
+    ).select_from(baker_counts).join(order_counts, true()).one()
+    
+    body = orjson_dumps({
+        'total_users': counts.users,
+        'total_bakers': counts.bakers,
+        'verified_bakers': counts.verified,
+        'pending_bakers': counts.bakers - counts.verified,
+        'total_products': counts.products,
+        'total_orders': counts.orders,
+        'pending_orders': counts.pending_orders,
+        'total_revenue': counts.revenue
+    })
+    cache_set(DASHBOARD_STATS_KEY, body, DASHBOARD_STATS_TTL)
+    
+    return json_bytes_response(body, 200)
 
 # User Management
 @admin_bp.route('/users', methods=['GET'])
 @admin_required
 def get_all_users():
     """Get all customer users"""
-    try:
-        users = User.query.filter_by(user_type='customer').all()
-        
-        return jsonify({
-            'users': [{
-                'id': str(user.id),
-                'name': user.name,
-                'email': user.email,
-                'user_type': user.user_type,
-                'is_blocked': user.is_blocked if hasattr(user, 'is_blocked') else False,
-                'total_orders': len(user.orders),
-                'created_at': user.created_at.isoformat()
-            } for user in users]
-        }), 200
-        
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    # Plain columns plus order counts, instead of User instances and user.orders
+    users, has_next, current_page = paginate_query(
+        db.session.query(
+            User.id,
+            User.name,
+            User.email,
+            User.user_type,
+            User.is_blocked,
+            User.created_at,
+            func.count(Order.id).label('order_count')
+        ).outerjoin(
+            Order, Order.user_id == User.id
+        ).filter(User.user_type == 'customer').group_by(User.id).order_by(User.id)
+    )
+    
+    return orjson_response({
+        'has_next': has_next,
+        'current_page': current_page,
+        'users': [{
+            'id': str(user.id),
+            'name': user.name,
+            'email': user.email,
+            'user_type': user.user_type,
+            'is_blocked': user.is_blocked,
+            'total_orders': user.order_count,
+            'created_at': user.created_at
+        } for user in users]
+    }, 200)
 
 @admin_bp.route('/users/<int:user_id>', methods=['GET'])
 @admin_required
 def get_user_details(user_id):
     """Get detailed user information"""
-    try:
-        user = User.query.get(user_id)
-        
-        if not user:
-            return jsonify({'error': 'User not found'}), 404
-        
-        user_data = {
-            'id': user.id,
-            'name': user.name,
-            'email': user.email,
-            'user_type': user.user_type,
-            'is_blocked': user.is_blocked if hasattr(user, 'is_blocked') else False,
-            'created_at': user.created_at.isoformat(),
-            'total_orders': len(user.orders),
-            'total_reviews': len(user.reviews)
-        }
-        
-        return jsonify(user_data), 200
-        
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    # User row and both counts in one SELECT
+    row = db.session.query(
+        User,
+        db.session.query(func.count(Order.id)).filter(
+            Order.user_id == User.id
+        ).correlate(User).scalar_subquery(),
+        db.session.query(func.count(Review.id)).filter(
+            Review.user_id == User.id
+        ).correlate(User).scalar_subquery()
+    ).filter(User.id == user_id).first()
+    
+    if not row:
+        return orjson_response({'error': 'User not found'}, 404)
+    
+    user, total_orders, total_reviews = row
+    
+    user_data = {
+        'id': user.id,
+        'name': user.name,
+        'email': user.email,
+        'user_type': user.user_type,
+        'is_blocked': user.is_blocked if hasattr(user, 'is_blocked') else False,
+        'created_at': user.created_at,
+        'total_orders': total_orders,
+        'total_reviews': total_reviews
+    }
+    
+    return orjson_response(user_data, 200)
 
 @admin_bp.route('/users', methods=['POST'])
 @admin_required
 def create_user():
     """Create a new customer user"""
     try:
-        data = request.get_json()
-        
-        # Validate required fields
-        required_fields = ['name', 'email', 'password']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({'error': f'Missing required field: {field}'}), 400
-        
-        # Check if user already exists
-        if User.query.filter_by(email=data['email']).first():
-            return jsonify({'error': 'Email already registered'}), 400
+        # Parse and validate the body in one pass
+        data = UserCreate.model_validate_json(request.get_data(cache=False))
         
         # Create new user
         user = User(
-            name=data['name'],
-            email=data['email'],
-            password_hash=generate_password_hash(data['password']),
+            name=data.name,
+            email=data.email,
+            password_hash=hash_password(data.password),
             user_type='customer',
             is_blocked=False
         )
@@ -232,7 +522,7 @@ def create_user():
         db.session.add(user)
         db.session.commit()
         
-        return jsonify({
+        return orjson_response({
             'message': 'User created successfully',
             'user': {
                 'id': user.id,
@@ -240,264 +530,205 @@ def create_user():
                 'email': user.email,
                 'user_type': user.user_type
             }
-        }), 201
+        }, 201)
         
-    except Exception as e:
+    except ValidationError as e:
+        return orjson_response({'error': validation_message(e)}, 400)
+        
+    except IntegrityError:
+        # The unique constraint on User.email doubles as the duplicate check
         db.session.rollback()
-        return jsonify({'error': str(e)}), 500
+        return orjson_response({'error': 'Email already registered'}, 400)
 
 @admin_bp.route('/users/<int:user_id>', methods=['DELETE'])
 @admin_required
 def delete_user(user_id):
     """Delete a user account"""
-    try:
-        user = User.query.get(user_id)
-        
-        if not user:
-            return jsonify({'error': 'User not found'}), 404
-        
-        # Prevent deleting baker accounts from user endpoint
-        if user.user_type == 'baker':
-            return jsonify({'error': 'Use baker deletion endpoint for baker accounts'}), 400
-        
-        db.session.delete(user)
-        db.session.commit()
-        
-        return jsonify({'message': 'User deleted successfully'}), 200
-        
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({'error': str(e)}), 500
+    user_type = db.session.query(User.user_type).filter(User.id == user_id).scalar()
+    
+    if not user_type:
+        return orjson_response({'error': 'User not found'}, 404)
+    
+    # Prevent deleting baker accounts from user endpoint
+    if user_type == 'baker':
+        return orjson_response({'error': 'Use baker deletion endpoint for baker accounts'}, 400)
+    
+    # Orders are kept for the sales records and must stay with their customer
+    if db.session.query(Order.id).filter(Order.user_id == user_id).first():
+        return orjson_response({'error': 'User has orders; block the account instead'}, 409)
+    
+    delete_user_rows(user_id)
+    db.session.commit()
+    invalidate_models(User, Review, Wishlist, Notification)
+    
+    return orjson_response({'message': 'User deleted successfully'}, 200)
 
 @admin_bp.route('/users/<int:user_id>/block', methods=['PUT'])
 @admin_required
 def block_user(user_id):
     """Block a user account"""
-    try:
-        user = User.query.get(user_id)
-        
-        if not user:
-            return jsonify({'error': 'User not found'}), 404
-        
-        user.is_blocked = True
-        db.session.commit()
-        
-        return jsonify({
-            'message': 'User blocked successfully',
-            'user': {
-                'id': user.id,
-                'name': user.name,
-                'is_blocked': user.is_blocked
-            }
-        }), 200
-        
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({'error': str(e)}), 500
+    user = db.session.get(User, user_id)
+    
+    if not user:
+        return orjson_response({'error': 'User not found'}, 404)
+    
+    user.is_blocked = True
+    db.session.commit()
+    
+    return orjson_response({
+        'message': 'User blocked successfully',
+        'user': {
+            'id': user.id,
+            'name': user.name,
+            'is_blocked': user.is_blocked
+        }
+    }, 200)
 
 @admin_bp.route('/users/<int:user_id>/unblock', methods=['PUT'])
 @admin_required
 def unblock_user(user_id):
     """Unblock a user account"""
-    try:
-        user = User.query.get(user_id)
-        
-        if not user:
-            return jsonify({'error': 'User not found'}), 404
-        
-        user.is_blocked = False
-        db.session.commit()
-        
-        return jsonify({
-            'message': 'User unblocked successfully',
-            'user': {
-                'id': user.id,
-                'name': user.name,
-                'is_blocked': user.is_blocked
-            }
-        }), 200
-        
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({'error': str(e)}), 500
+    user = db.session.get(User, user_id)
+    
+    if not user:
+        return orjson_response({'error': 'User not found'}, 404)
+    
+    user.is_blocked = False
+    db.session.commit()
+    
+    return orjson_response({
+        'message': 'User unblocked successfully',
+        'user': {
+            'id': user.id,
+            'name': user.name,
+            'is_blocked': user.is_blocked
+        }
+    }, 200)
 
 # Baker Management
 @admin_bp.route('/bakers/pending', methods=['GET'])
 @admin_required
 def get_pending_bakers():
     """Get pending bakers awaiting verification"""
-    try:
-        bakers = Baker.query.filter_by(verified=False).all()
-        
-        return jsonify({
-            'bakers': [{
-                'id': str(baker.id),
-                'shop_name': baker.shop_name,
-                'owner_name': baker.owner_name,
-                'phone': baker.phone,
-                'city': baker.city,
-                'state': baker.state,
-                'business_license': baker.business_license,
-                'tax_id': baker.tax_id,
-                'shop_description': baker.shop_description,
-                'verified': baker.verified,
-                'user_email': baker.user.email if baker.user else None,
-                'product_count': len(baker.products)
-            } for baker in bakers]
-        }), 200
-        
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    # Plain columns; product count as a correlated subquery, owner email via join
+    bakers, has_next, current_page = paginate_query(
+        baker_listing_query().filter(Baker.verified == False).order_by(Baker.id)
+    )
+    
+    return orjson_stream_response('bakers', bakers, baker_row, trailer=lambda: {
+        'has_next': has_next,
+        'current_page': current_page
+    })
 
 @admin_bp.route('/bakers', methods=['GET'])
 @admin_required
 def get_all_bakers():
     """Get all bakers"""
-    try:
-        bakers = Baker.query.all()
-        
-        return jsonify({
-            'bakers': [{
-                'id': str(baker.id),
-                'shop_name': baker.shop_name,
-                'owner_name': baker.owner_name,
-                'phone': baker.phone,
-                'city': baker.city,
-                'state': baker.state,
-                'business_license': baker.business_license,
-                'tax_id': baker.tax_id,
-                'shop_description': baker.shop_description,
-                'verified': baker.verified,
-                'user_email': baker.user.email if baker.user else None,
-                'product_count': len(baker.products)
-            } for baker in bakers]
-        }), 200
-        
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    # Plain columns; product count as a correlated subquery, owner email via join
+    bakers, has_next, current_page = paginate_query(
+        baker_listing_query().order_by(Baker.id)
+    )
+    
+    return orjson_stream_response('bakers', bakers, baker_row, trailer=lambda: {
+        'has_next': has_next,
+        'current_page': current_page
+    })
 
 @admin_bp.route('/bakers/<string:baker_id>/verify', methods=['PUT'])
 @admin_required
 def verify_baker(baker_id):
     """Verify a baker"""
-    try:
-        baker = Baker.query.get(int(baker_id))
-        
-        if not baker:
-            return jsonify({'error': 'Baker not found'}), 404
-        
-        baker.verified = True
-        db.session.commit()
-        
-        return jsonify({
-            'message': 'Baker verified successfully',
-            'baker': {
-                'id': baker.id,
-                'shop_name': baker.shop_name,
-                'verified': baker.verified
-            }
-        }), 200
-        
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({'error': str(e)}), 500
+    baker = db.session.get(Baker, int(baker_id))
+    
+    if not baker:
+        return orjson_response({'error': 'Baker not found'}, 404)
+    
+    baker.verified = True
+    db.session.commit()
+    
+    return orjson_response({
+        'message': 'Baker verified successfully',
+        'baker': {
+            'id': baker.id,
+            'shop_name': baker.shop_name,
+            'verified': baker.verified
+        }
+    }, 200)
 
 @admin_bp.route('/bakers/<string:baker_id>/reject', methods=['PUT'])
 @admin_required
 def reject_baker(baker_id):
     """Reject a baker application"""
-    try:
-        data = request.get_json()
-        baker = Baker.query.get(int(baker_id))
-        
-        if not baker:
-            return jsonify({'error': 'Baker not found'}), 404
-        
-        user = baker.user
-        db.session.delete(baker)
-        if user:
-            db.session.delete(user)
-        db.session.commit()
-        
-        return jsonify({
-            'message': 'Baker application rejected'
-        }), 200
-        
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({'error': str(e)}), 500
+    baker_id = int(baker_id)
+    user_id = db.session.query(Baker.user_id).filter(Baker.id == baker_id).scalar()
+    
+    if not user_id:
+        return orjson_response({'error': 'Baker not found'}, 404)
+    
+    product_ids = delete_baker_rows(baker_id, user_id)
+    db.session.commit()
+    invalidate_models(Review, Product, Baker, User)
+    forget_baker_id(user_id)
+    forget_product_cards(*product_ids)
+    
+    return orjson_response({
+        'message': 'Baker application rejected'
+    }, 200)
 
 @admin_bp.route('/bakers/<int:baker_id>', methods=['DELETE'])
 @admin_required
 def delete_baker(baker_id):
     """Delete a baker account"""
-    try:
-        baker = Baker.query.get(baker_id)
-        
-        if not baker:
-            return jsonify({'error': 'Baker not found'}), 404
-        
-        user = User.query.get(baker.user_id)
-        
-        db.session.delete(baker)
-        if user:
-            db.session.delete(user)
-        
-        db.session.commit()
-        
-        return jsonify({'message': 'Baker and associated account deleted successfully'}), 200
-        
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({'error': str(e)}), 500
+    user_id = db.session.query(Baker.user_id).filter(Baker.id == baker_id).scalar()
+    
+    if not user_id:
+        return orjson_response({'error': 'Baker not found'}, 404)
+    
+    product_ids = delete_baker_rows(baker_id, user_id)
+    db.session.commit()
+    invalidate_models(Review, Product, Baker, User)
+    forget_baker_id(user_id)
+    forget_product_cards(*product_ids)
+    
+    return orjson_response({'message': 'Baker and associated account deleted successfully'}, 200)
 
 @admin_bp.route('/bakers', methods=['POST'])
 @admin_required
 def create_baker():
     """Create a new baker account"""
     try:
-        data = request.get_json()
-        
-        required_fields = ['email', 'password', 'shop_name', 'owner_name', 'phone', 
-                          'business_license', 'tax_id', 'shop_address', 'city', 'state', 
-                          'zip_code', 'shop_description']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({'error': f'Missing required field: {field}'}), 400
-        
-        if User.query.filter_by(email=data['email']).first():
-            return jsonify({'error': 'Email already registered'}), 400
+        # Parse and validate the body in one pass
+        data = BakerCreate.model_validate_json(request.get_data(cache=False))
         
         user = User(
-            name=data['owner_name'],
-            email=data['email'],
-            password_hash=generate_password_hash(data['password']),
+            name=data.owner_name,
+            email=data.email,
+            password_hash=hash_password(data.password),
             user_type='baker',
             is_blocked=False
         )
         
-        db.session.add(user)
-        db.session.flush()
-        
+        # Linking through the relationship lets the unit of work insert the
+        # user and baker in order at commit, without an intermediate flush
         baker = Baker(
-            user_id=user.id,
-            shop_name=data['shop_name'],
-            owner_name=data['owner_name'],
-            phone=data['phone'],
-            business_license=data['business_license'],
-            tax_id=data['tax_id'],
-            shop_address=data['shop_address'],
-            city=data['city'],
-            state=data['state'],
-            zip_code=data['zip_code'],
-            shop_description=data['shop_description'],
-            verified=data.get('verified', False)
+            user=user,
+            shop_name=data.shop_name,
+            owner_name=data.owner_name,
+            phone=data.phone,
+            business_license=data.business_license,
+            tax_id=data.tax_id,
+            shop_address=data.shop_address,
+            city=data.city,
+            state=data.state,
+            zip_code=data.zip_code,
+            shop_description=data.shop_description,
+            verified=data.verified
         )
         
         db.session.add(baker)
         db.session.commit()
         
-        return jsonify({
+        return orjson_response({
             'message': 'Baker created successfully',
             'baker': {
                 'id': baker.id,
@@ -507,201 +738,308 @@ def create_baker():
                 'email': user.email,
                 'verified': baker.verified
             }
-        }), 201
+        }, 201)
         
-    except Exception as e:
+    except ValidationError as e:
+        return orjson_response({'error': validation_message(e)}, 400)
+        
+    except IntegrityError:
+        # The unique constraint on User.email doubles as the duplicate check
         db.session.rollback()
-        return jsonify({'error': str(e)}), 500
+        return orjson_response({'error': 'Email already registered'}, 400)
 
 # Order Management
 @admin_bp.route('/orders', methods=['GET'])
 @admin_required
 def get_all_orders():
-    """Get all orders"""
-    try:
-        orders = Order.query.order_by(desc(Order.created_at)).all()
-        
-        return jsonify({
-            'orders': [{
-                'id': str(order.id),
-                'order_id': order.order_id,
-                'customer_name': order.user.name if order.user else 'Unknown User',
-                'customer_email': order.user.email if order.user else 'N/A',
-                'total_amount': order.total_amount,
-                'status': order.status,
-                'payment_status': order.payment_status,
-                'created_at': order.created_at.isoformat(),
-                'items': [{
-                    'product_id': item.product_id,
-                    'product_name': item.product_name,
-                    'baker_name': item.baker_name,
-                    'quantity': item.quantity,
-                    'price': item.price
-                } for item in order.items]
-            } for order in orders]
-        }), 200
-        
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    """Get all orders, optionally filtered by status and paged by (created_at, id) cursor"""
+    status = request.args.get('status')
+    cursor = request.args.get('cursor')
+    limit = request.args.get('limit')
+    if limit is not None:
+        limit = parse_limit(limit)
+        if not limit:
+            return orjson_response({'error': 'limit must be a positive integer'}, 400)
+    
+    query = Order.query.options(
+        joinedload(Order.user),
+        selectinload(Order.items)
+    )
+    
+    if status:
+        query = query.filter(Order.status == status)
+    
+    # Keyset pagination: seek past the last row seen instead of OFFSET
+    if cursor:
+        after = parse_cursor(cursor)
+        if not after:
+            return orjson_response({'error': 'Invalid cursor'}, 400)
+        query = query.filter(tuple_(Order.created_at, Order.id) < after)
+    
+    query = query.order_by(desc(Order.created_at), desc(Order.id))
+    if limit:
+        # One extra row tells us whether another page exists
+        query = query.limit(limit + 1)
+    
+    page = {'has_next': False, 'next_cursor': None}
+    
+    def rows():
+        # Fetch in batches while streaming instead of loading every order
+        last = None
+        for index, order in enumerate(query.yield_per(STREAM_BATCH_SIZE)):
+            if limit and index == limit:
+                page['has_next'] = True
+                page['next_cursor'] = page_cursor(last.created_at, last.id)
+                break
+            last = order
+            yield order
+    
+    return orjson_stream_response('orders', rows(), lambda order: {
+        'id': str(order.id),
+        'order_id': order.order_id,
+        'customer_name': order.user.name if order.user else 'Unknown User',
+        'customer_email': order.user.email if order.user else 'N/A',
+        'total_amount': order.total_amount,
+        'status': order.status,
+        'payment_status': order.payment_status,
+        'created_at': order.created_at,
+        'items': [{
+            'product_id': item.product_id,
+            'product_name': item.product_name,
+            'baker_name': item.baker_name,
+            'quantity': item.quantity,
+            'price': item.price
+        } for item in order.items]
+    }, trailer=lambda: page)
 
 # Review Management
 @admin_bp.route('/reviews', methods=['GET'])
 @admin_required
 def get_all_reviews():
-    """Get all reviews"""
-    try:
-        reviews = Review.query.order_by(desc(Review.created_at)).all()
-        
-        return jsonify({
-            'reviews': [{
-                'id': str(review.id),
-                'user_name': review.user.name if review.user else 'Unknown',
-                'product_name': review.product.name if review.product else 'Unknown',
-                'rating': review.rating,
-                'comment': review.comment,
-                'baker_reply': review.baker_reply,
-                'created_at': review.created_at.isoformat()
-            } for review in reviews]
-        }), 200
-        
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    """Get all reviews, optionally paged by (created_at, id) cursor"""
+    cursor = request.args.get('cursor')
+    limit = request.args.get('limit')
+    if limit is not None:
+        limit = parse_limit(limit)
+        if not limit:
+            return orjson_response({'error': 'limit must be a positive integer'}, 400)
+    
+    # Plain rows instead of Review/User/Product instances
+    query = Review.query.outerjoin(
+        User, Review.user_id == User.id
+    ).outerjoin(
+        Product, Review.product_id == Product.id
+    ).with_entities(
+        Review.id,
+        User.name.label('user_name'),
+        Product.name.label('product_name'),
+        Review.rating,
+        Review.comment,
+        Review.baker_reply,
+        Review.created_at
+    )
+    
+    # Keyset pagination: seek past the last row seen instead of OFFSET
+    if cursor:
+        after = parse_cursor(cursor)
+        if not after:
+            return orjson_response({'error': 'Invalid cursor'}, 400)
+        query = query.filter(tuple_(Review.created_at, Review.id) < after)
+    
+    query = query.order_by(desc(Review.created_at), desc(Review.id))
+    if limit:
+        # One extra row tells us whether another page exists
+        query = query.limit(limit + 1)
+    
+    reviews = query.all()
+    has_next = bool(limit) and len(reviews) > limit
+    if has_next:
+        reviews = reviews[:limit]
+    next_cursor = page_cursor(reviews[-1].created_at, reviews[-1].id) if has_next else None
+    
+    return orjson_response({
+        'has_next': has_next,
+        'next_cursor': next_cursor,
+        'reviews': [{
+            'id': str(review.id),
+            'user_name': review.user_name or 'Unknown',
+            'product_name': review.product_name or 'Unknown',
+            'rating': review.rating,
+            'comment': review.comment,
+            'baker_reply': review.baker_reply,
+            'created_at': review.created_at
+        } for review in reviews]
+    }, 200)
 
 # Sales Reports
 @admin_bp.route('/reports/sales', methods=['GET'])
 @admin_required
 def get_sales_report():
     """Get sales report with revenue breakdown"""
-    try:
-        # Get completed orders only
-        completed_orders = Order.query.filter_by(payment_status='completed').all()
-        total_revenue = sum(order.total_amount for order in completed_orders)
-        total_orders = len(completed_orders)
-        
-        # Revenue by baker
-        baker_revenue = {}
-        for order in completed_orders:
-            for item in order.items:
-                if item.product and item.product.baker:
-                    baker = item.product.baker
-                    baker_id = str(baker.id)
-                    
-                    if baker_id not in baker_revenue:
-                        baker_revenue[baker_id] = {
-                            'baker_id': baker_id,
-                            'baker_name': baker.shop_name,
-                            'revenue': 0,
-                            'orders': set()
-                        }
-                    
-                    baker_revenue[baker_id]['revenue'] += item.price * item.quantity
-                    baker_revenue[baker_id]['orders'].add(order.id)
-        
-        # Convert to list
-        revenue_by_baker = []
-        for baker_data in baker_revenue.values():
-            revenue_by_baker.append({
-                'baker_id': baker_data['baker_id'],
-                'baker_name': baker_data['baker_name'],
-                'revenue': baker_data['revenue'],
-                'orders': len(baker_data['orders'])
-            })
-        
-        revenue_by_baker.sort(key=lambda x: x['revenue'], reverse=True)
-        
-        # Top products
-        product_stats = {}
-        for order in completed_orders:
-            for item in order.items:
-                product_id = str(item.product_id) if item.product_id else 'unknown'
-                product_name = item.product_name
-                
-                if product_id not in product_stats:
-                    product_stats[product_id] = {
-                        'product_id': product_id,
-                        'product_name': product_name,
-                        'quantity_sold': 0,
-                        'revenue': 0
-                    }
-                
-                product_stats[product_id]['quantity_sold'] += item.quantity
-                product_stats[product_id]['revenue'] += item.price * item.quantity
-        
-        top_products = sorted(
-            product_stats.values(),
-            key=lambda x: x['revenue'],
-            reverse=True
-        )[:10]
-        
-        return jsonify({
-            'total_revenue': total_revenue,
-            'total_orders': total_orders,
-            'revenue_by_baker': revenue_by_baker,
-            'top_products': top_products
-        }), 200
-        
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    cached = cache_get(SALES_REPORT_KEY)
+    if cached:
+        return json_bytes_response(cached, 200)
+    
+    # Totals over completed orders
+    total_orders, total_revenue = db.session.query(
+        func.count(Order.id),
+        func.coalesce(func.sum(Order.total_amount), 0)
+    ).filter(Order.payment_status == 'completed').one()
+    
+    item_revenue = func.sum(OrderItem.price * OrderItem.quantity)
+    
+    # Revenue by baker, via the products on completed order items
+    baker_rows = db.session.query(
+        Baker.id,
+        Baker.shop_name,
+        item_revenue.label('revenue'),
+        func.count(distinct(OrderItem.order_id)).label('orders')
+    ).join(
+        Product, Product.baker_id == Baker.id
+    ).join(
+        OrderItem, OrderItem.product_id == Product.id
+    ).join(
+        Order, Order.id == OrderItem.order_id
+    ).filter(
+        Order.payment_status == 'completed'
+    ).group_by(Baker.id, Baker.shop_name).order_by(desc('revenue')).all()
+    
+    revenue_by_baker = [{
+        'baker_id': str(row.id),
+        'baker_name': row.shop_name,
+        'revenue': row.revenue,
+        'orders': row.orders
+    } for row in baker_rows]
+    
+    # Top products
+    product_rows = db.session.query(
+        OrderItem.product_id,
+        func.max(OrderItem.product_name).label('product_name'),
+        func.sum(OrderItem.quantity).label('quantity_sold'),
+        item_revenue.label('revenue')
+    ).join(
+        Order, Order.id == OrderItem.order_id
+    ).filter(
+        Order.payment_status == 'completed'
+    ).group_by(OrderItem.product_id).order_by(desc('revenue')).limit(10).all()
+    
+    top_products = [{
+        'product_id': str(row.product_id) if row.product_id else 'unknown',
+        'product_name': row.product_name,
+        'quantity_sold': row.quantity_sold,
+        'revenue': row.revenue
+    } for row in product_rows]
+    
+    body = orjson_dumps({
+        'total_revenue': total_revenue,
+        'total_orders': total_orders,
+        'revenue_by_baker': revenue_by_baker,
+        'top_products': top_products
+    })
+    cache_set(SALES_REPORT_KEY, body, SALES_REPORT_TTL)
+    
+    return json_bytes_response(body, 200)
 
 # Payment Monitoring
 @admin_bp.route('/payments', methods=['GET'])
 @admin_required
 def get_all_payments():
-    """Get all Razorpay payment transactions"""
-    try:
-        payments = Payment.query.order_by(desc(Payment.created_at)).all()
-        
-        return jsonify({
-            'payments': [{
-                'id': str(payment.id),
-                'order_id': payment.order_id,
-                'order_number': payment.order.order_id if payment.order else 'N/A',
-                'razorpay_order_id': payment.razorpay_order_id,
-                'razorpay_payment_id': payment.razorpay_payment_id or 'N/A',
-                'amount': payment.amount,
-                'currency': payment.currency,
-                'status': payment.status,
-                'method': payment.method or 'N/A',
-                'email': payment.email or 'N/A',
-                'contact': payment.contact or 'N/A',
-                'error_code': payment.error_code,
-                'error_description': payment.error_description,
-                'created_at': payment.created_at.isoformat(),
-                'updated_at': payment.updated_at.isoformat()
-            } for payment in payments]
-        }), 200
-        
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    """Get all Razorpay payment transactions, optionally paged by (created_at, id) cursor"""
+    cursor = request.args.get('cursor')
+    limit = request.args.get('limit')
+    if limit is not None:
+        limit = parse_limit(limit)
+        if not limit:
+            return orjson_response({'error': 'limit must be a positive integer'}, 400)
+    
+    # Plain rows instead of Payment/Order instances
+    query = Payment.query.outerjoin(
+        Order, Payment.order_id == Order.id
+    ).with_entities(
+        Payment.id,
+        Payment.order_id,
+        Order.order_id.label('order_number'),
+        Payment.razorpay_order_id,
+        Payment.razorpay_payment_id,
+        Payment.amount,
+        Payment.currency,
+        Payment.status,
+        Payment.method,
+        Payment.email,
+        Payment.contact,
+        Payment.error_code,
+        Payment.error_description,
+        Payment.created_at,
+        Payment.updated_at
+    )
+    
+    # Keyset pagination: seek past the last row seen instead of OFFSET
+    if cursor:
+        after = parse_cursor(cursor)
+        if not after:
+            return orjson_response({'error': 'Invalid cursor'}, 400)
+        query = query.filter(tuple_(Payment.created_at, Payment.id) < after)
+    
+    query = query.order_by(desc(Payment.created_at), desc(Payment.id))
+    if limit:
+        # One extra row tells us whether another page exists
+        query = query.limit(limit + 1)
+    
+    page = {'has_next': False, 'next_cursor': None}
+    
+    def rows():
+        # Fetch in batches while streaming instead of loading every payment
+        last = None
+        for index, payment in enumerate(query.yield_per(STREAM_BATCH_SIZE)):
+            if limit and index == limit:
+                page['has_next'] = True
+                page['next_cursor'] = page_cursor(last.created_at, last.id)
+                break
+            last = payment
+            yield payment
+    
+    return orjson_stream_response('payments', rows(), lambda payment: {
+        'id': str(payment.id),
+        'order_id': payment.order_id,
+        'order_number': payment.order_number or 'N/A',
+        'razorpay_order_id': payment.razorpay_order_id,
+        'razorpay_payment_id': payment.razorpay_payment_id or 'N/A',
+        'amount': payment.amount,
+        'currency': payment.currency,
+        'status': payment.status,
+        'method': payment.method or 'N/A',
+        'email': payment.email or 'N/A',
+        'contact': payment.contact or 'N/A',
+        'error_code': payment.error_code,
+        'error_description': payment.error_description,
+        'created_at': payment.created_at,
+        'updated_at': payment.updated_at
+    }, trailer=lambda: page)
 
 @admin_bp.route('/payments/<int:payment_id>', methods=['GET'])
 @admin_required
 def get_payment_details(payment_id):
     """Get detailed payment information"""
-    try:
-        payment = Payment.query.get(payment_id)
-        
-        if not payment:
-            return jsonify({'error': 'Payment not found'}), 404
-        
-        return jsonify({
-            'id': payment.id,
-            'order_id': payment.order_id,
-            'order_number': payment.order.order_id if payment.order else 'N/A',
-            'razorpay_order_id': payment.razorpay_order_id,
-            'razorpay_payment_id': payment.razorpay_payment_id,
-            'razorpay_signature': payment.razorpay_signature,
-            'amount': payment.amount,
-            'currency': payment.currency,
-            'status': payment.status,
-            'method': payment.method,
-            'email': payment.email,
-            'contact': payment.contact,
-            'error_code': payment.error_code,
-            'error_description': payment.error_description,
-            'created_at': payment.created_at.isoformat(),
-            'updated_at': payment.updated_at.isoformat()
-        }), 200
-        
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    payment = db.session.get(Payment, payment_id, options=[joinedload(Payment.order)])
+    
+    if not payment:
+        return orjson_response({'error': 'Payment not found'}, 404)
+    
+    return orjson_response({
+        'id': payment.id,
+        'order_id': payment.order_id,
+        'order_number': payment.order.order_id if payment.order else 'N/A',
+        'razorpay_order_id': payment.razorpay_order_id,
+        'razorpay_payment_id': payment.razorpay_payment_id,
+        'razorpay_signature': payment.razorpay_signature,
+        'amount': payment.amount,
+        'currency': payment.currency,
+        'status': payment.status,
+        'method': payment.method,
+        'email': payment.email,
+        'contact': payment.contact,
+        'error_code': payment.error_code,
+        'error_description': payment.error_description,
+        'created_at': payment.created_at,
+        'updated_at': payment.updated_at
+    }, 200)
@@ -1,9 +1,13 @@
 """
 Advanced features service including loyalty points, reviews, and analytics
 """
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Dict, List, Optional
-import random
+from collections import Counter
+from itertools import islice, count
+from operator import itemgetter
+import heapq
+from bisect import bisect_right
 
 class LoyaltyService:
     """Manage customer loyalty points and rewards"""
@@ -25,18 +29,15 @@ class LoyaltyService:
     @staticmethod
     def get_level(total_points: int) -> str:
         """Get loyalty level based on points"""
-        for level in reversed(list(LoyaltyService.LEVELS.keys())):
-            if total_points >= LoyaltyService.LEVELS[level]:
-                return level
-        return 'Bronze'
+        return _LEVEL_NAMES[_level_index(total_points)]
     
     @staticmethod
     def get_next_level_info(total_points: int) -> Dict:
         """Get info about next loyalty level"""
-        current_level = LoyaltyService.get_level(total_points)
-        levels_list = list(LoyaltyService.LEVELS.keys())
+        idx = _level_index(total_points)
+        current_level = _LEVEL_NAMES[idx]
         
-        if current_level == 'Diamond':
+        if idx == len(_LEVEL_NAMES) - 1:
             return {
                 'current_level': current_level,
                 'next_level': None,
@@ -44,12 +45,11 @@ class LoyaltyService:
                 'progress': 100
             }
         
-        current_idx = levels_list.index(current_level)
-        next_level = levels_list[current_idx + 1]
-        next_level_points = LoyaltyService.LEVELS[next_level]
+        next_level = _LEVEL_NAMES[idx + 1]
+        next_level_points = _LEVEL_THRESHOLDS[idx + 1]
         
         points_needed = next_level_points - total_points
-        current_level_points = LoyaltyService.LEVELS[current_level]
+        current_level_points = _LEVEL_THRESHOLDS[idx]
         progress = ((total_points - current_level_points) / 
                    (next_level_points - current_level_points) * 100)
         
@@ -60,6 +60,14 @@ class LoyaltyService:
             'progress': int(progress)
         }
 
+# Level names and their point thresholds, ascending, built once at import
+_LEVEL_NAMES = tuple(LoyaltyService.LEVELS)
+_LEVEL_THRESHOLDS = tuple(LoyaltyService.LEVELS.values())
+
+def _level_index(total_points: int) -> int:
+    """Index of the highest level whose threshold total_points reaches"""
+    return max(bisect_right(_LEVEL_THRESHOLDS, total_points) - 1, 0)
+
 class BadgeService:
     """Manage achievement badges"""
     
@@ -126,43 +134,26 @@ class BadgeService:
         }
     }
     
+    # (stat, minimum value, badge) in the order badges are reported
+    BADGE_RULES = (
+        ('total_orders', 1, 'first_order'),
+        ('total_orders', 10, 'loyal_customer'),
+        ('total_spent', 100, 'big_spender'),
+        ('pastries_ordered', 10, 'sweet_tooth'),
+        ('bread_ordered', 20, 'bread_lover'),
+        ('reviews_count', 10, 'review_master'),
+        ('recipes_tried', 5, 'recipe_chef'),
+        ('unique_bakers', 5, 'community_supporter')
+    )
+    
     @staticmethod
     def check_badge_eligibility(user_stats: Dict) -> List[str]:
         """Check which badges user has earned"""
-        earned_badges = []
-        
-        # First order
-        if user_stats.get('total_orders', 0) >= 1:
-            earned_badges.append('first_order')
-        
-        # Loyal customer
-        if user_stats.get('total_orders', 0) >= 10:
-            earned_badges.append('loyal_customer')
-        
-        # Big spender
-        if user_stats.get('total_spent', 0) >= 100:
-            earned_badges.append('big_spender')
-        
-        # Category specific
-        if user_stats.get('pastries_ordered', 0) >= 10:
-            earned_badges.append('sweet_tooth')
-        
-        if user_stats.get('bread_ordered', 0) >= 20:
-            earned_badges.append('bread_lover')
-        
-        # Reviews
-        if user_stats.get('reviews_count', 0) >= 10:
-            earned_badges.append('review_master')
-        
-        # Recipes
-        if user_stats.get('recipes_tried', 0) >= 5:
-            earned_badges.append('recipe_chef')
-        
-        # Bakers
-        if user_stats.get('unique_bakers', 0) >= 5:
-            earned_badges.append('community_supporter')
-        
-        return earned_badges
+        stat_value = user_stats.get
+        return [
+            badge for stat, minimum, badge in BadgeService.BADGE_RULES
+            if stat_value(stat, 0) >= minimum
+        ]
 
 class AnalyticsService:
     """Generate analytics and insights"""
@@ -181,56 +172,52 @@ class AnalyticsService:
                 'customer_retention': 0
             }
         
-        # Calculate metrics
-        total_revenue = sum(o.total_amount for o in orders if o.payment_status == 'completed')
-        avg_order = total_revenue / len(orders) if orders else 0
-        
-        # Top products
-        product_sales = {}
+        # Revenue trend buckets (last 7 days)
+        # Keyed by proleptic ordinal so each order costs an int, not a date object
+        today = datetime.now().toordinal()
+        revenue_by_day = {day: 0 for day in range(today - 6, today + 1)}
+        
+        # Single pass over orders and their items
+        total_revenue = 0
+        completed_orders = 0
+        product_names = {}
+        product_quantity = Counter()
+        product_revenue = Counter()
+        hour_counts = [0] * 24
         for order in orders:
+            if order.payment_status == 'completed':
+                total_revenue += order.total_amount
+                day = order.created_at.toordinal()
+                if day in revenue_by_day:
+                    revenue_by_day[day] += order.total_amount
+            if order.status == 'delivered':
+                completed_orders += 1
+            hour_counts[order.created_at.hour] += 1
+            
             for item in order.items:
-                if item.product_id not in product_sales:
-                    product_sales[item.product_id] = {
-                        'name': item.product_name,
-                        'quantity': 0,
-                        'revenue': 0
-                    }
-                product_sales[item.product_id]['quantity'] += item.quantity
-                product_sales[item.product_id]['revenue'] += item.price * item.quantity
-        
-        top_products = sorted(
-            product_sales.values(),
-            key=lambda x: x['revenue'],
-            reverse=True
-        )[:5]
+                product_id = item.product_id
+                product_names.setdefault(product_id, item.product_name)
+                product_quantity[product_id] += item.quantity
+                product_revenue[product_id] += item.price * item.quantity
         
-        # Revenue trend (last 7 days)
-        revenue_by_day = {}
-        for i in range(7):
-            date = (datetime.now() - timedelta(days=i)).strftime('%Y-%m-%d')
-            revenue_by_day[date] = 0
+        avg_order = total_revenue / len(orders)
         
-        for order in orders:
-            if order.payment_status == 'completed':
-                date = order.created_at.strftime('%Y-%m-%d')
-                if date in revenue_by_day:
-                    revenue_by_day[date] += order.total_amount
+        # Top products
+        top_products = [{
+            'name': product_names[product_id],
+            'quantity': product_quantity[product_id],
+            'revenue': revenue
+        } for product_id, revenue in product_revenue.most_common(5)]
         
         revenue_trend = [
-            {'date': date, 'revenue': revenue}
-            for date, revenue in sorted(revenue_by_day.items())
+            {'date': date.fromordinal(day).isoformat(), 'revenue': revenue}
+            for day, revenue in revenue_by_day.items()
         ]
-    
-        hour_counts = {}
-        for order in orders:
-            hour = order.created_at.hour
-            hour_counts[hour] = hour_counts.get(hour, 0) + 1
         
-        peak_hours = sorted(
-            [{'hour': h, 'orders': c} for h, c in hour_counts.items()],
-            key=lambda x: x['orders'],
-            reverse=True
-        )[:3]
+        peak_hours = [
+            {'hour': h, 'orders': c}
+            for h, c in heapq.nlargest(3, enumerate(hour_counts), key=itemgetter(1)) if c
+        ]
         
         return {
             'total_revenue': round(total_revenue, 2),
@@ -239,7 +226,7 @@ class AnalyticsService:
             'revenue_trend': revenue_trend,
             'peak_hours': peak_hours,
             'total_orders': len(orders),
-            'completed_orders': len([o for o in orders if o.status == 'delivered'])
+            'completed_orders': completed_orders
         }
     
     @staticmethod
@@ -276,11 +263,14 @@ class AnalyticsService:
 class NotificationService:
     """Manage notifications for users"""
     
+    # Sequential ids; next() on itertools.count is atomic under the GIL
+    _ids = count(10000)
+    
     @staticmethod
     def create_notification(user_id: int, title: str, message: str, type: str = 'info') -> Dict:
         """Create a notification"""
         return {
-            'id': random.randint(1000, 9999),
+            'id': next(NotificationService._ids),
             'user_id': user_id,
             'title': title,
             'message': message,
@@ -327,36 +317,39 @@ class RecommendationEngine:
     @staticmethod
     def get_collaborative_recommendations(user_orders: List, all_orders: List, products: List) -> List:
         """Collaborative filtering recommendations"""
+        user_products = {item.product_id for order in user_orders for item in order.items}
         
-        user_products = set()
-        for order in user_orders:
-            for item in order.items:
-                user_products.add(item.product_id)
+        # An order needs two products in common with the user to count as similar
+        if len(user_products) < 2:
+            return []
         
         similar_user_products = set()
         for order in all_orders:
-            order_products = set(item.product_id for item in order.items)
+            items = order.items
+            if len(items) < 2:
+                continue
+            order_products = {item.product_id for item in items}
             
             if len(order_products & user_products) >= 2:
-                similar_user_products.update(order_products)
+                similar_user_products |= order_products
         
         recommended_ids = similar_user_products - user_products
+        if not recommended_ids:
+            return []
         
-        return [p for p in products if p.id in recommended_ids][:5]
+        return list(islice((p for p in products if p.id in recommended_ids), 5))
     
     @staticmethod
     def get_trending_products(orders: List, products: List, days: int = 7) -> List:
         """Get trending products"""
         cutoff_date = datetime.utcnow() - timedelta(days=days)
         
-        product_scores = {}
+        product_scores = Counter()
         for order in orders:
             if order.created_at >= cutoff_date:
                 for item in order.items:
-                    if item.product_id not in product_scores:
-                        product_scores[item.product_id] = 0
                     product_scores[item.product_id] += item.quantity
         
-        trending_ids = sorted(product_scores.keys(), key=lambda x: product_scores[x], reverse=True)[:5]
+        trending_ids = {product_id for product_id, _ in product_scores.most_common(5)}
         
         return [p for p in products if p.id in trending_ids]
@@ -4,7 +4,12 @@ Gemini AI service for recipe suggestions and recommendations
 import google.generativeai as genai
 import os
 from dotenv import load_dotenv
-import json
+import re
+import hashlib
+import threading
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from cache_service import cache_get, cache_set
 
 load_dotenv()
 
@@ -17,6 +22,150 @@ else:
     model = None
     print("⚠️  Gemini API key not configured")
 
+# Gemini replies are cached per prompt, so identical carts and ingredient
+# lists skip the API round-trip until AI_CACHE_TTL expires
+AI_CACHE_TTL = 3600
+
+# Gemini calls run on a small worker pool so a request waits at most
+# GEMINI_TIMEOUT seconds before falling back. At most GEMINI_MAX_IN_FLIGHT
+# calls run at once; beyond that requests fall back immediately instead of
+# queueing behind a slow API
+GEMINI_TIMEOUT = float(os.getenv('GEMINI_TIMEOUT', '15'))
+GEMINI_MAX_IN_FLIGHT = int(os.getenv('GEMINI_MAX_IN_FLIGHT', '8'))
+_ai_executor = ThreadPoolExecutor(max_workers=GEMINI_MAX_IN_FLIGHT, thread_name_prefix='gemini')
+_ai_slots = threading.BoundedSemaphore(GEMINI_MAX_IN_FLIGHT)
+
+# Calls in flight by cache key, so identical prompts arriving before the
+# first reply is cached share one call
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+# Markdown code fence Gemini sometimes wraps its JSON in
+_CODE_FENCE = re.compile(r'\A```(?:json)?|```\Z')
+
+# Prompt templates, filled in with str.format per request
+RECIPE_PROMPT = """
+Based on these bakery items that a customer has in their cart: {products_text}
+
+Please suggest 3 creative and delicious recipes or meal ideas that would pair well with these items.
+
+For each recipe, provide:
+1. Recipe name
+2. Brief description (1-2 sentences)
+3. Why it pairs well with the cart items
+4. Difficulty level (Easy/Medium/Hard)
+5. Preparation time
+
+Format the response as a JSON array with these fields:
+[
+    {{
+        "name": "Recipe Name",
+        "description": "Brief description",
+        "pairing_reason": "Why it pairs well",
+        "difficulty": "Easy",
+        "prep_time": "30 minutes",
+        "ingredients_needed": ["ingredient1", "ingredient2"],
+        "serving_suggestion": "How to serve"
+    }}
+]
+
+Keep it practical and family-friendly. Focus on recipes that highlight fresh bread and baked goods.
+Return ONLY the JSON array, no other text.
+"""
+
+RECOMMENDATION_PROMPT = """
+A customer has previously enjoyed these bakery items: {preferences_text}
+
+From this available product list: {products_text}
+
+Recommend 5 products they would most likely enjoy based on their preferences.
+Consider flavor profiles, product types, and complementary items.
+
+Return ONLY a JSON array of product names from the available list:
+["Product Name 1", "Product Name 2", "Product Name 3", "Product Name 4", "Product Name 5"]
+
+Return ONLY the JSON array, no other text.
+"""
+
+RECIPE_FROM_SCRATCH_PROMPT = """
+Create a delicious recipe using these bakery items and common ingredients: {ingredients_text}
+Dietary preference: {dietary_preference}
+
+Provide:
+1. Recipe name
+2. Full ingredient list with measurements
+3. Step-by-step instructions
+4. Cooking time and servings
+5. Nutritional highlights
+
+Format as JSON:
+{{
+    "name": "Recipe Name",
+    "servings": 4,
+    "prep_time": "15 min",
+    "cook_time": "30 min",
+    "ingredients": [{{"item": "ingredient", "amount": "measurement"}}],
+    "instructions": ["Step 1", "Step 2"],
+    "nutritional_info": "Brief nutritional highlights",
+    "tips": ["Tip 1", "Tip 2"]
+}}
+
+Return ONLY the JSON, no other text.
+"""
+
+def normalize_items(items: list) -> list:
+    """Sort and de-duplicate item names so equivalent inputs build the same prompt"""
+    return sorted(set(items))
+
+def _request_json(prompt: str, key: str):
+    """Call Gemini, parse the JSON reply and cache it (runs on the AI executor)"""
+    response = model.generate_content(prompt)
+    text = _CODE_FENCE.sub('', response.text.strip()).strip().encode('utf-8')
+    
+    data = orjson.loads(text)
+    # Only replies that parsed are cached
+    cache_set(key, text, AI_CACHE_TTL)
+    return data
+
+def generate_json(prompt: str):
+    """
+    Send a prompt to Gemini and parse its JSON reply, reusing cached replies
+    
+    Raises:
+        Exception if the API call fails, times out, too many calls are in
+        flight or the reply is not valid JSON
+    """
+    key = 'ai:' + hashlib.blake2b(prompt.encode('utf-8'), digest_size=16).hexdigest()
+    cached = cache_get(key)
+    if cached:
+        return orjson.loads(cached)
+    
+    with _in_flight_lock:
+        future = _in_flight.get(key)
+        started = future is None
+        if started:
+            if not _ai_slots.acquire(blocking=False):
+                raise RuntimeError('Too many Gemini requests in flight')
+            try:
+                future = _ai_executor.submit(_request_json, prompt, key)
+            except Exception:
+                _ai_slots.release()
+                raise
+            _in_flight[key] = future
+    
+    if started:
+        # The slot is freed when the call finishes, not when the caller stops waiting
+        future.add_done_callback(lambda _: _call_finished(key))
+    
+    # A call that outlives GEMINI_TIMEOUT keeps running and still fills the cache
+    return future.result(timeout=GEMINI_TIMEOUT)
+
+def _call_finished(key: str):
+    """Forget a finished call and free its slot"""
+    with _in_flight_lock:
+        _in_flight.pop(key, None)
+    _ai_slots.release()
+
 def get_recipe_suggestions(cart_items: list) -> dict:
     """
     Get recipe suggestions based on cart items
@@ -34,49 +183,10 @@ def get_recipe_suggestions(cart_items: list) -> dict:
         }
     
     try:
-        products_text = ", ".join(cart_items)
-        prompt = f"""
-        Based on these bakery items that a customer has in their cart: {products_text}
-        
-        Please suggest 3 creative and delicious recipes or meal ideas that would pair well with these items.
-        
-        For each recipe, provide:
-        1. Recipe name
-        2. Brief description (1-2 sentences)
-        3. Why it pairs well with the cart items
-        4. Difficulty level (Easy/Medium/Hard)
-        5. Preparation time
-        
-        Format the response as a JSON array with these fields:
-        [
-            {{
-                "name": "Recipe Name",
-                "description": "Brief description",
-                "pairing_reason": "Why it pairs well",
-                "difficulty": "Easy",
-                "prep_time": "30 minutes",
-                "ingredients_needed": ["ingredient1", "ingredient2"],
-                "serving_suggestion": "How to serve"
-            }}
-        ]
-        
-        Keep it practical and family-friendly. Focus on recipes that highlight fresh bread and baked goods.
-        Return ONLY the JSON array, no other text.
-        """
-        
-        response = model.generate_content(prompt)
-        
-        text = response.text.strip()
+        products_text = ", ".join(normalize_items(cart_items))
+        prompt = RECIPE_PROMPT.format(products_text=products_text)
         
-        if text.startswith('```json'):
-            text = text[7:]
-        if text.startswith('```'):
-            text = text[3:]
-        if text.endswith('```'):
-            text = text[:-3]
-        text = text.strip()
-        
-        recipes = json.loads(text)
+        recipes = generate_json(prompt)
         
         return {
             'recipes': recipes,
@@ -139,35 +249,12 @@ def get_product_recommendations(user_preferences: list, available_products: list
         return available_products[:3] if len(available_products) >= 3 else available_products
     
     try:
-        preferences_text = ", ".join(user_preferences)
+        preferences_text = ", ".join(normalize_items(user_preferences))
         products_text = ", ".join(available_products)
         
-        prompt = f"""
-        A customer has previously enjoyed these bakery items: {preferences_text}
-        
-        From this available product list: {products_text}
-        
-        Recommend 5 products they would most likely enjoy based on their preferences.
-        Consider flavor profiles, product types, and complementary items.
-        
-        Return ONLY a JSON array of product names from the available list:
-        ["Product Name 1", "Product Name 2", "Product Name 3", "Product Name 4", "Product Name 5"]
-        
-        Return ONLY the JSON array, no other text.
-        """
-        
-        response = model.generate_content(prompt)
-        text = response.text.strip()
+        prompt = RECOMMENDATION_PROMPT.format(preferences_text=preferences_text, products_text=products_text)
         
-        if text.startswith('```json'):
-            text = text[7:]
-        if text.startswith('```'):
-            text = text[3:]
-        if text.endswith('```'):
-            text = text[:-3]
-        text = text.strip()
-        
-        recommendations = json.loads(text)
+        recommendations = generate_json(prompt)
         return recommendations[:5]
         
     except Exception as e:
@@ -182,46 +269,11 @@ def generate_recipe_from_scratch(ingredients: list, dietary_preference: str = "n
         return None
     
     try:
-        ingredients_text = ", ".join(ingredients)
-        
-        prompt = f"""
-        Create a delicious recipe using these bakery items and common ingredients: {ingredients_text}
-        Dietary preference: {dietary_preference}
-        
-        Provide:
-        1. Recipe name
-        2. Full ingredient list with measurements
-        3. Step-by-step instructions
-        4. Cooking time and servings
-        5. Nutritional highlights
-        
-        Format as JSON:
-        {{
-            "name": "Recipe Name",
-            "servings": 4,
-            "prep_time": "15 min",
-            "cook_time": "30 min",
-            "ingredients": [{{"item": "ingredient", "amount": "measurement"}}],
-            "instructions": ["Step 1", "Step 2"],
-            "nutritional_info": "Brief nutritional highlights",
-            "tips": ["Tip 1", "Tip 2"]
-        }}
-        
-        Return ONLY the JSON, no other text.
-        """
-        
-        response = model.generate_content(prompt)
-        text = response.text.strip()
+        ingredients_text = ", ".join(normalize_items(ingredients))
         
-        if text.startswith('```json'):
-            text = text[7:]
-        if text.startswith('```'):
-            text = text[3:]
-        if text.endswith('```'):
-            text = text[:-3]
-        text = text.strip()
+        prompt = RECIPE_FROM_SCRATCH_PROMPT.format(ingredients_text=ingredients_text, dietary_preference=dietary_preference)
         
-        recipe = json.loads(text)
+        recipe = generate_json(prompt)
         return recipe
         
     except Exception as e:
@@ -1,15 +1,27 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-from werkzeug.security import generate_password_hash, check_password_hash
-from datetime import datetime, timedelta
-import jwt
-import random
+import click
+from datetime import datetime
+from token_service import decode_token, encode_token
+from baker_service import get_baker_id
+from product_service import get_product_cards
+import secrets
+import hmac
+import time
+from itertools import count
 import os
-import json
+import orjson
+from functools import wraps
 from dotenv import load_dotenv
-from email_service import send_otp_email, send_order_confirmation
+from email_service import queue_otp_email, send_order_confirmation
+from password_service import hash_password, verify_password
+from cache_service import cache_get, cache_set, cache_pop, invalidate_on_commit, invalidate_models
+from orjson_response import ORJSONProvider, orjson_response, orjson_stream_response, orjson_dumps, json_bytes_response, public_json_response, json_body
 
-from database import db, User, Baker, Product, Order, OrderItem, Review, Wishlist, Notification, Admin
+from sqlalchemy import func, case, insert, select
+from sqlalchemy.orm import joinedload, selectinload, contains_eager
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from database import db, User, Baker, Product, Order, OrderItem, Review, Wishlist, Notification, Admin, upgrade_indexes, find_duplicate_rows, delete_duplicate_rows
 
 try:
     from ai_service import get_recipe_suggestions, get_product_recommendations
@@ -23,48 +35,129 @@ from razorpay_service import create_razorpay_order
 load_dotenv()
 
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 CORS(app, resources={r"/api/*": {"origins": "*", "allow_headers": "*", "expose_headers": "*"}})
 
 app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///local_crust.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Size the pool for concurrent workers; pre-ping drops stale connections and
+# LIFO keeps a small set of connections warm
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'pool_size': 20,
+    'max_overflow': 30,
+    'pool_pre_ping': True,
+    'pool_recycle': 1800,
+    'pool_use_lifo': True,
+    # Pooled SQLite connections are shared across threads (QueuePool already
+    # sets check_same_thread=False); wait up to 30s for the write lock instead
+    # of failing with "database is locked"
+    'connect_args': {'timeout': 30},
+    # JSON columns (de)serialize with orjson
+    'json_serializer': lambda obj: orjson.dumps(obj).decode('utf-8'),
+    'json_deserializer': orjson.loads
+}
 app.config['SECRET_KEY'] = 'your-secret-key-change-in-production'
 
 
 db.init_app(app)
 
-otp_storage = {}
+# Public catalogue listings are the same for every visitor; they are cached
+# briefly and dropped as soon as a baker or product change is committed.
+# Browsers and proxies may also reuse them for PUBLIC_LISTING_TTL seconds and
+# revalidate with their ETag afterwards
+PUBLIC_BAKERS_KEY = 'public:bakers:v1'
+PUBLIC_PRODUCTS_KEY = 'public:products:v1'
+PUBLIC_LISTING_TTL = 60
+invalidate_on_commit(PUBLIC_BAKERS_KEY, Baker, Product)
+invalidate_on_commit(PUBLIC_PRODUCTS_KEY, Baker, Product)
+
+# Caps on request bodies; cart and product lists for the AI routes are small
+AI_BODY_LIMIT = 256 * 1024
+REVIEW_BODY_LIMIT = 32 * 1024
+
+# OTPs live in the shared cache (Redis when configured) and expire on their own
+OTP_TTL = 300
+
+def otp_cache_key(email):
+    """Cache key for an email's pending OTP"""
+    return f'otp:{email}'
 
 with app.app_context():
     db.create_all()
+    upgrade_indexes()
+
+@app.cli.command('remove-duplicate-rows')
+@click.option('--apply', is_flag=True, help='Delete the listed rows and create the unique indexes')
+def remove_duplicate_rows(apply):
+    """List rows that block the unique indexes; delete them with --apply"""
+    with db.engine.begin() as connection:
+        found = find_duplicate_rows(connection)
+        if not found:
+            click.echo('No duplicate rows found')
+            return
+        
+        for name, rows in found.items():
+            click.echo(f'{name}: {len(rows)} row(s) to delete')
+            for row in rows:
+                click.echo(f'  {dict(row)}')
+        
+        if not apply:
+            raise click.ClickException('Nothing deleted; run again with --apply to delete these rows')
+        
+        delete_duplicate_rows(connection, found)
+    
+    upgrade_indexes()
+    click.echo('Duplicate rows deleted and unique indexes created')
 
 def generate_otp():
     """Generate a 6-digit OTP"""
-    return str(random.randint(100000, 999999))
+    return str(secrets.randbelow(900000) + 100000)
+
+# Per-process sequence appended to the order id timestamp, so ids issued by
+# one worker never collide even within the same clock tick
+_order_sequence = count()
 
 def generate_order_id():
     """Generate unique order ID"""
-    timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
-    random_part = random.randint(1000, 9999)
-    return f"LC{timestamp}{random_part}"
+    return f"LC{time.time_ns():X}{next(_order_sequence):X}"
 
 def create_token(user_id, user_type):
     """Create JWT token"""
-    payload = {
-        'user_id': user_id,
-        'user_type': user_type,
-        'exp': datetime.utcnow() + timedelta(days=7)
-    }
-    return jwt.encode(payload, app.config['SECRET_KEY'], algorithm='HS256')
+    return encode_token(user_id, user_type, app.config['SECRET_KEY'])
 
 def verify_token(token):
     """Verify JWT token"""
-    try:
-        payload = jwt.decode(token, app.config['SECRET_KEY'], algorithms=['HS256'])
-        return payload
-    except jwt.ExpiredSignatureError:
-        return None
-    except jwt.InvalidTokenError:
-        return None
+    return decode_token(token, app.config['SECRET_KEY'])
+
+def require_auth(user_type=None, load_baker=False):
+    """
+    Require a valid Bearer token, optionally for one user type
+    The verified payload is available to the route as request.auth_payload;
+    with load_baker, the user's baker id as request.baker_id
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            # Read the raw header from the WSGI environ, skipping the headers wrapper
+            auth_header = request.environ.get('HTTP_AUTHORIZATION', '')
+            if not auth_header.startswith('Bearer '):
+                return jsonify({'error': 'Authorization required'}), 401
+            
+            payload = verify_token(auth_header[7:])
+            if not payload or (user_type and payload.get('user_type') != user_type):
+                return jsonify({'error': 'Invalid or expired token'}), 401
+            
+            request.auth_payload = payload
+            
+            if load_baker:
+                baker_id = get_baker_id(payload['user_id'])
+                if not baker_id:
+                    return jsonify({'error': 'Baker profile not found'}), 404
+                request.baker_id = baker_id
+            
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
@@ -82,13 +175,17 @@ def register():
             if field not in data:
                 return jsonify({'error': f'Missing required field: {field}'}), 400
         
+        # Hash before the first query so the KDF does not run while the
+        # session holds a connection
+        password_hash = hash_password(data['password'])
+        
         if User.query.filter_by(email=data['email']).first():
             return jsonify({'error': 'Email already registered'}), 400
         
         user = User(
             name=data['name'],
             email=data['email'],
-            password_hash=generate_password_hash(data['password']),
+            password_hash=password_hash,
             user_type=data['user_type']
         )
         
@@ -123,7 +220,7 @@ def login():
         
         user = User.query.filter_by(email=data['email']).first()
         
-        if not user or not check_password_hash(user.password_hash, data['password']):
+        if not user or not verify_password(user.password_hash, data['password']):
             return jsonify({'error': 'Invalid email or password'}), 401
         
         token = create_token(user.id, user.user_type)
@@ -167,12 +264,9 @@ def send_otp():
         
         otp = generate_otp()
         
-        otp_storage[email] = {
-            'otp': otp,
-            'expires_at': datetime.utcnow() + timedelta(minutes=5)
-        }
+        cache_set(otp_cache_key(email), otp.encode('utf-8'), OTP_TTL)
         
-        email_sent = send_otp_email(email, otp)
+        email_sent = queue_otp_email(email, otp)
     
         print(f"OTP for {email}: {otp}")
         
@@ -197,20 +291,15 @@ def verify_otp():
         email = data['email']
         otp = data['otp']
         
-        if email not in otp_storage:
+        # Taken and deleted atomically, so concurrent requests cannot both
+        # use the same code; a wrong guess also uses it up
+        stored_otp = cache_pop(otp_cache_key(email))
+        if not stored_otp:
             return jsonify({'error': 'OTP not found or expired'}), 400
         
-        stored_otp_data = otp_storage[email]
-        
-        if datetime.utcnow() > stored_otp_data['expires_at']:
-            del otp_storage[email]
-            return jsonify({'error': 'OTP expired'}), 400
-        
-        if stored_otp_data['otp'] != otp:
+        if not hmac.compare_digest(stored_otp, str(otp).encode('utf-8')):
             return jsonify({'error': 'Invalid OTP'}), 401
         
-        del otp_storage[email]
-        
         user = User.query.filter_by(email=email).first()
         if not user:
             return jsonify({'error': 'User not found'}), 404
@@ -248,13 +337,17 @@ def register_baker():
             if field not in data:
                 return jsonify({'error': f'Missing required field: {field}'}), 400
         
+        # Hash before the first query so the KDF does not run while the
+        # session holds a connection
+        password_hash = hash_password(data['password'])
+        
         if User.query.filter_by(email=data['email']).first():
             return jsonify({'error': 'Email already registered'}), 400
         
         user = User(
             name=data['owner_name'],
             email=data['email'],
-            password_hash=generate_password_hash(data['password']),
+            password_hash=password_hash,
             user_type='baker'
         )
         
@@ -280,19 +373,19 @@ def register_baker():
         db.session.add(baker)
         db.session.flush()  
         
-        
-        for product_data in data['products']:
-            product = Product(
-                baker_id=baker.id,
-                name=product_data['name'],
-                category=product_data['category'],
-                price=float(product_data['price']),
-                description=product_data.get('description', ''),
-                in_stock=True
-            )
-            db.session.add(product)
+        # All products in one executemany INSERT instead of one ORM object each
+        if data['products']:
+            db.session.execute(insert(Product), [{
+                'baker_id': baker.id,
+                'name': product_data['name'],
+                'category': product_data['category'],
+                'price': float(product_data['price']),
+                'description': product_data.get('description', ''),
+                'in_stock': True
+            } for product_data in data['products']])
         
         db.session.commit()
+        invalidate_models(Product)
         
         token = create_token(user.id, user.user_type)
         
@@ -320,12 +413,12 @@ def register_baker():
 def get_baker_profile(baker_id):
     """Get baker profile details"""
     try:
-        baker = Baker.query.get(baker_id)
+        baker = db.session.get(Baker, baker_id)
         
         if not baker:
             return jsonify({'error': 'Baker not found'}), 404
         
-        return jsonify({
+        return public_json_response(orjson_dumps({
             'id': baker.id,
             'shop_name': baker.shop_name,
             'owner_name': baker.owner_name,
@@ -343,7 +436,7 @@ def get_baker_profile(baker_id):
                 'image_url': p.image_url,
                 'in_stock': p.in_stock
             } for p in baker.products]
-        }), 200
+        }), PUBLIC_LISTING_TTL)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -352,18 +445,38 @@ def get_baker_profile(baker_id):
 def get_all_bakers():
     """Get all verified bakers"""
     try:
-        bakers = Baker.query.filter_by(verified=True).all()
-        
-        return jsonify({
+        cached = cache_get(PUBLIC_BAKERS_KEY)
+        if cached:
+            return public_json_response(cached, PUBLIC_LISTING_TTL)
+        
+        # Product count as a column instead of loading every baker's products
+        product_count = db.session.query(func.count(Product.id)).filter(
+            Product.baker_id == Baker.id
+        ).correlate(Baker).scalar_subquery()
+        
+        # Only the listed columns, so no Baker instances are built
+        bakers = db.session.query(
+            Baker.id,
+            Baker.shop_name,
+            Baker.shop_description,
+            Baker.city,
+            Baker.state,
+            product_count.label('product_count')
+        ).filter(Baker.verified == True).all()
+        
+        body = orjson_dumps({
             'bakers': [{
                 'id': baker.id,
                 'shop_name': baker.shop_name,
                 'shop_description': baker.shop_description,
                 'city': baker.city,
                 'state': baker.state,
-                'product_count': len(baker.products)
+                'product_count': baker.product_count
             } for baker in bakers]
-        }), 200
+        })
+        cache_set(PUBLIC_BAKERS_KEY, body, PUBLIC_LISTING_TTL)
+        
+        return public_json_response(body, PUBLIC_LISTING_TTL)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -372,12 +485,20 @@ def get_all_bakers():
 def get_all_products():
     """Get all products from verified bakers"""
     try:
-        products = db.session.query(Product).join(Baker).filter(
+        cached = cache_get(PUBLIC_PRODUCTS_KEY)
+        if cached:
+            return public_json_response(cached, PUBLIC_LISTING_TTL)
+        
+        # Fill Product.baker from the JOIN already made for the filter
+        products = db.session.query(Product).join(Baker).options(
+            contains_eager(Product.baker)
+        ).filter(
             Baker.verified == True,
             Product.in_stock == True
         ).all()
         
-        return jsonify({
+        # Serialized once with orjson; the same bytes are cached and returned
+        body = orjson_dumps({
             'products': [{
                 'id': p.id,
                 'name': p.name,
@@ -392,28 +513,20 @@ def get_all_products():
                     'city': p.baker.city
                 }
             } for p in products]
-        }), 200
+        })
+        cache_set(PUBLIC_PRODUCTS_KEY, body, PUBLIC_LISTING_TTL)
+        
+        return public_json_response(body, PUBLIC_LISTING_TTL)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/baker/products', methods=['POST'])
+@require_auth('baker', load_baker=True)
 def add_product():
     """Add a new product (requires authentication)"""
     try:
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or not auth_header.startswith('Bearer '):
-            return jsonify({'error': 'Authorization required'}), 401
-        
-        token = auth_header.split(' ')[1]
-        payload = verify_token(token)
-        
-        if not payload or payload['user_type'] != 'baker':
-            return jsonify({'error': 'Invalid or expired token'}), 401
-        
-        user = User.query.get(payload['user_id'])
-        if not user or not user.baker_profile:
-            return jsonify({'error': 'Baker profile not found'}), 404
+        baker_id = request.baker_id
         
         data = request.get_json()
         
@@ -423,7 +536,7 @@ def add_product():
                 return jsonify({'error': f'Missing required field: {field}'}), 400
         
         product = Product(
-            baker_id=user.baker_profile.id,
+            baker_id=baker_id,
             name=data['name'],
             category=data['category'],
             price=float(data['price']),
@@ -449,18 +562,11 @@ def add_product():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/orders', methods=['POST'])
+@require_auth()
 def create_order():
     """Create a new order"""
     try:
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or not auth_header.startswith('Bearer '):
-            return jsonify({'error': 'Authorization required'}), 401
-        
-        token = auth_header.split(' ')[1]
-        payload = verify_token(token)
-        
-        if not payload:
-            return jsonify({'error': 'Invalid or expired token'}), 401
+        payload = request.auth_payload
         
         data = request.get_json()
         
@@ -477,27 +583,37 @@ def create_order():
             total_amount=data['total_amount'],
             status='pending',
             payment_status='pending',
-            delivery_address=json.dumps(data['delivery_address'])
+            delivery_address=data['delivery_address']
         )
         
         db.session.add(order)
         db.session.flush()
         
+        # Name and shop of every ordered product in one query instead of two per item
+        product_ids = {item_data['product_id'] for item_data in data['items']}
+        products = {
+            product.id: product for product in db.session.query(
+                Product.id, Product.name, Baker.shop_name
+            ).join(Baker).filter(Product.id.in_(product_ids))
+        }
+        
+        order_items = []
         for item_data in data['items']:
-            product = Product.query.get(item_data['product_id'])
+            product = products.get(item_data['product_id'])
             if not product:
                 raise ValueError(f"Product {item_data['product_id']} not found")
             
-            order_item = OrderItem(
+            order_items.append(OrderItem(
                 order_id=order.id,
                 product_id=product.id,
                 product_name=product.name,
-                baker_name=product.baker.shop_name,
+                baker_name=product.shop_name,
                 quantity=item_data['quantity'],
                 price=item_data['price']
-            )
-            db.session.add(order_item)
+            ))
         
+        # Flushed together as one batched INSERT
+        db.session.add_all(order_items)
         db.session.commit()
         
         razorpay_result = create_razorpay_order(
@@ -516,7 +632,7 @@ def create_order():
             'total_amount': order.total_amount,
             'status': order.status,
             'payment_status': order.payment_status,
-            'created_at': order.created_at.isoformat(),
+            'created_at': order.created_at,
             'items': [{
                 'product_id': item.product_id,
                 'product_name': item.product_name,
@@ -529,27 +645,20 @@ def create_order():
         if razorpay_result['success']:
             response_data['razorpay_order_id'] = razorpay_result['razorpay_order_id']
         
-        return jsonify(response_data), 201
+        return orjson_response(response_data, 201)
         
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/orders/<int:order_id>/payment', methods=['PUT'])
+@require_auth()
 def update_payment_status(order_id):
     """Update payment status for an order"""
     try:
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or not auth_header.startswith('Bearer '):
-            return jsonify({'error': 'Authorization required'}), 401
-        
-        token = auth_header.split(' ')[1]
-        payload = verify_token(token)
+        payload = request.auth_payload
         
-        if not payload:
-            return jsonify({'error': 'Invalid or expired token'}), 401
-        
-        order = Order.query.get(order_id)
+        order = db.session.get(Order, order_id)
         if not order:
             return jsonify({'error': 'Order not found'}), 404
         
@@ -578,44 +687,33 @@ def update_payment_status(order_id):
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/orders/my-orders', methods=['GET'])
+@require_auth()
 def get_user_orders():
     """Get all orders for the logged-in user"""
     try:
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or not auth_header.startswith('Bearer '):
-            return jsonify({'error': 'Authorization required'}), 401
-        
-        token = auth_header.split(' ')[1]
-        payload = verify_token(token)
-        
-        if not payload:
-            return jsonify({'error': 'Invalid or expired token'}), 401
-        
-        orders = Order.query.filter_by(user_id=payload['user_id']).order_by(Order.created_at.desc()).all()
-        
-        result_orders = []
-        for order in orders:
-            result_orders.append({
-                'id': order.id,
-                'order_id': order.order_id,
-                'total_amount': order.total_amount,
-                'status': order.status,
-                'payment_status': order.payment_status,
-                'created_at': order.created_at.isoformat(),
-                'items': [{
-                    'product_id': item.product_id,  
-                    'product_name': item.product_name,
-                    'baker_name': item.baker_name,
-                    'quantity': item.quantity,
-                    'price': item.price
-                } for item in order.items]
-            })
+        payload = request.auth_payload
         
-        print(f"Returning {len(result_orders)} orders for user {payload['user_id']}")
+        # Items for each batch of orders in one IN query instead of one SELECT per order;
+        # batches are written out as they arrive
+        orders = Order.query.options(
+            selectinload(Order.items)
+        ).filter_by(user_id=payload['user_id']).order_by(Order.created_at.desc()).yield_per(500)
         
-        return jsonify({
-            'orders': result_orders
-        }), 200
+        return orjson_stream_response('orders', orders, lambda order: {
+            'id': order.id,
+            'order_id': order.order_id,
+            'total_amount': order.total_amount,
+            'status': order.status,
+            'payment_status': order.payment_status,
+            'created_at': order.created_at,
+            'items': [{
+                'product_id': item.product_id,
+                'product_name': item.product_name,
+                'baker_name': item.baker_name,
+                'quantity': item.quantity,
+                'price': item.price
+            } for item in order.items]
+        })
         
     except Exception as e:
         print(f"Error fetching user orders: {str(e)}")
@@ -624,20 +722,13 @@ def get_user_orders():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/orders/<int:order_id>', methods=['GET'])
+@require_auth()
 def get_order_by_id(order_id):
     """Get order details by ID"""
     try:
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or not auth_header.startswith('Bearer '):
-            return jsonify({'error': 'Authorization required'}), 401
-        
-        token = auth_header.split(' ')[1]
-        payload = verify_token(token)
+        payload = request.auth_payload
         
-        if not payload:
-            return jsonify({'error': 'Invalid or expired token'}), 401
-        
-        order = Order.query.get(order_id)
+        order = db.session.get(Order, order_id, options=[selectinload(Order.items)])
         if not order:
             return jsonify({'error': 'Order not found'}), 404
         
@@ -646,14 +737,14 @@ def get_order_by_id(order_id):
         
         print(f"Fetching order {order_id} for user {payload['user_id']}")
         
-        return jsonify({
+        return orjson_response({
             'id': order.id,
             'order_id': order.order_id,
             'total_amount': order.total_amount,
             'status': order.status,
             'payment_status': order.payment_status,
-            'delivery_address': json.loads(order.delivery_address),
-            'created_at': order.created_at.isoformat(),
+            'delivery_address': order.delivery_address,
+            'created_at': order.created_at,
             'items': [{
                 'product_id': item.product_id,  
                 'product_name': item.product_name,
@@ -661,7 +752,7 @@ def get_order_by_id(order_id):
                 'quantity': item.quantity,
                 'price': item.price
             } for item in order.items]
-        }), 200
+        })
         
     except Exception as e:
         print(f"Error fetching order {order_id}: {str(e)}")
@@ -670,36 +761,28 @@ def get_order_by_id(order_id):
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/baker/dashboard/stats', methods=['GET'])
+@require_auth('baker', load_baker=True)
 def get_baker_dashboard_stats():
     """Get dashboard statistics for baker"""
     try:
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or not auth_header.startswith('Bearer '):
-            return jsonify({'error': 'Authorization required'}), 401
-        
-        token = auth_header.split(' ')[1]
-        payload = verify_token(token)
+        baker_id = request.baker_id
         
-        if not payload or payload['user_type'] != 'baker':
-            return jsonify({'error': 'Invalid or expired token'}), 401
+        # Orders containing at least one of this baker's products
+        baker_order_ids = db.session.query(OrderItem.order_id).join(
+            Product, Product.id == OrderItem.product_id
+        ).filter(Product.baker_id == baker_id)
         
-        user = User.query.get(payload['user_id'])
-        if not user or not user.baker_profile:
-            return jsonify({'error': 'Baker profile not found'}), 404
+        product_count = db.session.query(func.count(Product.id)).filter(
+            Product.baker_id == baker_id
+        ).scalar_subquery()
         
-        baker = user.baker_profile
-        
-        baker_product_ids = [p.id for p in baker.products]
-        
-        order_items = OrderItem.query.filter(OrderItem.product_id.in_(baker_product_ids)).all()
-        order_ids = list(set([item.order_id for item in order_items]))
-        
-        orders = Order.query.filter(Order.id.in_(order_ids)).all() if order_ids else []
-        
-        total_orders = len(orders)
-        total_products = len(baker.products)
-        total_revenue = sum(order.total_amount for order in orders if order.payment_status == 'completed')
-        pending_orders = len([o for o in orders if o.status in ['pending', 'confirmed', 'preparing']])
+        # Order aggregates and the product count in one SELECT
+        total_orders, total_revenue, pending_orders, total_products = db.session.query(
+            func.count(Order.id),
+            func.coalesce(func.sum(case((Order.payment_status == 'completed', Order.total_amount), else_=0)), 0),
+            func.coalesce(func.sum(case((Order.status.in_(['pending', 'confirmed', 'preparing']), 1), else_=0)), 0),
+            product_count
+        ).filter(Order.id.in_(baker_order_ids)).one()
         
         return jsonify({
             'totalOrders': total_orders,
@@ -712,64 +795,41 @@ def get_baker_dashboard_stats():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/baker/products', methods=['GET'])
+@require_auth('baker', load_baker=True)
 def get_baker_products():
     """Get all products for the logged-in baker"""
     try:
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or not auth_header.startswith('Bearer '):
-            return jsonify({'error': 'Authorization required'}), 401
-        
-        token = auth_header.split(' ')[1]
-        payload = verify_token(token)
-        
-        if not payload or payload['user_type'] != 'baker':
-            return jsonify({'error': 'Invalid or expired token'}), 401
-        
-        user = User.query.get(payload['user_id'])
-        if not user or not user.baker_profile:
-            return jsonify({'error': 'Baker profile not found'}), 404
-        
-        baker = user.baker_profile
-        
-        return jsonify({
-            'products': [{
-                'id': p.id,
-                'name': p.name,
-                'category': p.category,
-                'price': p.price,
-                'description': p.description,
-                'image_url': p.image_url,
-                'in_stock': p.in_stock,
-                'created_at': p.created_at.isoformat()
-            } for p in baker.products]
-        }), 200
+        baker_id = request.baker_id
+        
+        # Rows are fetched in batches and written out as they arrive
+        products = Product.query.filter_by(baker_id=baker_id).order_by(Product.id).yield_per(500)
+        
+        return orjson_stream_response('products', products, lambda p: {
+            'id': p.id,
+            'name': p.name,
+            'category': p.category,
+            'price': p.price,
+            'description': p.description,
+            'image_url': p.image_url,
+            'in_stock': p.in_stock,
+            'created_at': p.created_at
+        })
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/baker/products/<int:product_id>', methods=['PUT'])
+@require_auth('baker', load_baker=True)
 def update_baker_product(product_id):
     """Update a product"""
     try:
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or not auth_header.startswith('Bearer '):
-            return jsonify({'error': 'Authorization required'}), 401
-        
-        token = auth_header.split(' ')[1]
-        payload = verify_token(token)
-        
-        if not payload or payload['user_type'] != 'baker':
-            return jsonify({'error': 'Invalid or expired token'}), 401
-        
-        user = User.query.get(payload['user_id'])
-        if not user or not user.baker_profile:
-            return jsonify({'error': 'Baker profile not found'}), 404
+        baker_id = request.baker_id
         
-        product = Product.query.get(product_id)
+        product = db.session.get(Product, product_id)
         if not product:
             return jsonify({'error': 'Product not found'}), 404
         
-        if product.baker_id != user.baker_profile.id:
+        if product.baker_id != baker_id:
             return jsonify({'error': 'Unauthorized'}), 403
         
         data = request.get_json()
@@ -805,28 +865,17 @@ def update_baker_product(product_id):
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/baker/products/<int:product_id>', methods=['DELETE'])
+@require_auth('baker', load_baker=True)
 def delete_baker_product(product_id):
     """Delete a product"""
     try:
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or not auth_header.startswith('Bearer '):
-            return jsonify({'error': 'Authorization required'}), 401
+        baker_id = request.baker_id
         
-        token = auth_header.split(' ')[1]
-        payload = verify_token(token)
-        
-        if not payload or payload['user_type'] != 'baker':
-            return jsonify({'error': 'Invalid or expired token'}), 401
-        
-        user = User.query.get(payload['user_id'])
-        if not user or not user.baker_profile:
-            return jsonify({'error': 'Baker profile not found'}), 404
-        
-        product = Product.query.get(product_id)
+        product = db.session.get(Product, product_id)
         if not product:
             return jsonify({'error': 'Product not found'}), 404
         
-        if product.baker_id != user.baker_profile.id:
+        if product.baker_id != baker_id:
             return jsonify({'error': 'Unauthorized'}), 403
         
         db.session.delete(product)
@@ -841,42 +890,29 @@ def delete_baker_product(product_id):
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/baker/orders', methods=['GET'])
+@require_auth('baker', load_baker=True)
 def get_baker_orders():
     """Get all orders for the logged-in baker"""
     try:
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or not auth_header.startswith('Bearer '):
-            return jsonify({'error': 'Authorization required'}), 401
-        
-        token = auth_header.split(' ')[1]
-        payload = verify_token(token)
-        
-        if not payload or payload['user_type'] != 'baker':
-            return jsonify({'error': 'Invalid or expired token'}), 401
-        
-        user = User.query.get(payload['user_id'])
-        if not user or not user.baker_profile:
-            return jsonify({'error': 'Baker profile not found'}), 404
-        
-        baker = user.baker_profile
-        
-        baker_product_ids = [p.id for p in baker.products]
-        
-        order_items = OrderItem.query.filter(OrderItem.product_id.in_(baker_product_ids)).all()
-        order_ids = list(set([item.order_id for item in order_items]))
-        
-        orders = Order.query.filter(Order.id.in_(order_ids)).order_by(Order.created_at.desc()).all() if order_ids else []
-        
-        result = []
-        for order in orders:
-            baker_items = [item for item in order.items if item.product_id in baker_product_ids]
-            
-            try:
-                delivery_address = json.loads(order.delivery_address)
-            except:
-                delivery_address = {}
-            
-            result.append({
+        baker_id = request.baker_id
+        
+        # This baker's products; an order line belongs to the baker through its product
+        baker_product_ids = select(Product.id).where(Product.baker_id == baker_id)
+        baker_line = OrderItem.product_id.in_(baker_product_ids)
+        
+        # Orders containing at least one of this baker's lines, with their
+        # customers. Rows are fetched in batches and written out as they
+        # arrive; each batch loads only the baker's own lines in one query
+        orders = Order.query.options(
+            joinedload(Order.user),
+            selectinload(Order.items.and_(baker_line))
+        ).filter(
+            Order.id.in_(select(OrderItem.order_id).where(baker_line))
+        ).order_by(Order.created_at.desc()).yield_per(200)
+        
+        def serialize(order):
+            delivery_address = order.delivery_address or {}
+            return {
                 'id': order.id,
                 'order_id': order.order_id,
                 'customer_name': order.user.name,
@@ -887,101 +923,76 @@ def get_baker_orders():
                     'product_name': item.product_name,
                     'quantity': item.quantity,
                     'price': item.price
-                } for item in baker_items],
-                'total_amount': sum(item.price * item.quantity for item in baker_items),
+                } for item in order.items],
+                # Baker's share of the order
+                'total_amount': sum(item.price * item.quantity for item in order.items),
                 'status': order.status,
                 'payment_status': order.payment_status,
                 'delivery_address': delivery_address,
-                'created_at': order.created_at.isoformat()
-            })
+                'created_at': order.created_at
+            }
         
-        return jsonify({
-            'orders': result
-        }), 200
+        return orjson_stream_response('orders', orders, serialize)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/wishlist', methods=['GET'])
+@require_auth()
 def get_wishlist():
     """Get user's wishlist"""
     try:
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or not auth_header.startswith('Bearer '):
-            return jsonify({'error': 'Authorization required'}), 401
-        
-        token = auth_header.split(' ')[1]
-        payload = verify_token(token)
-        
-        if not payload:
-            return jsonify({'error': 'Invalid or expired token'}), 401
-        
-        wishlist_items = Wishlist.query.filter_by(user_id=payload['user_id']).all()
+        payload = request.auth_payload
+        
+        wishlist_rows = db.session.query(
+            Wishlist.id, Wishlist.product_id, Wishlist.created_at
+        ).filter(Wishlist.user_id == payload['user_id']).order_by(Wishlist.id).all()
+        
+        # Product cards come from the shared cache as JSON bytes and are
+        # spliced into each entry without decoding them again
+        cards = get_product_cards(product_id for _, product_id, _ in wishlist_rows)
+        entries = [
+            b'{"id":%d,"product_id":%d,"product":%s,"created_at":%s}' % (
+                wishlist_id, product_id, cards[product_id], orjson_dumps(created_at)
+            )
+            for wishlist_id, product_id, created_at in wishlist_rows
+            if product_id in cards
+        ]
         
-        return jsonify({
-            'wishlist': [{
-                'id': item.id,
-                'product_id': item.product_id,
-                'product': {
-                    'id': item.product.id,
-                    'name': item.product.name,
-                    'category': item.product.category,
-                    'price': item.product.price,
-                    'description': item.product.description,
-                    'image_url': item.product.image_url,
-                    'in_stock': item.product.in_stock,
-                    'baker': {
-                        'id': item.product.baker.id,
-                        'shop_name': item.product.baker.shop_name,
-                        'city': item.product.baker.city
-                    }
-                },
-                'created_at': item.created_at.isoformat()
-            } for item in wishlist_items]
-        }), 200
+        return json_bytes_response(b'{"wishlist":[' + b','.join(entries) + b']}')
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/wishlist/<int:product_id>', methods=['POST'])
+@require_auth()
 def add_to_wishlist(product_id):
     """Add product to wishlist"""
     try:
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or not auth_header.startswith('Bearer '):
-            return jsonify({'error': 'Authorization required'}), 401
-        
-        token = auth_header.split(' ')[1]
-        payload = verify_token(token)
-        
-        if not payload:
-            return jsonify({'error': 'Invalid or expired token'}), 401
+        payload = request.auth_payload
         
-        product = Product.query.get(product_id)
+        product = db.session.get(Product, product_id)
         if not product:
             return jsonify({'error': 'Product not found'}), 404
         
-        existing = Wishlist.query.filter_by(
-            user_id=payload['user_id'],
-            product_id=product_id
-        ).first()
+        # Insert and duplicate check in one atomic statement; the unique
+        # user/product index turns a second add into a no-op
+        wishlist_id = db.session.execute(
+            sqlite_insert(Wishlist).values(
+                user_id=payload['user_id'],
+                product_id=product_id
+            ).on_conflict_do_nothing(index_elements=['user_id', 'product_id']).returning(Wishlist.id)
+        ).scalar()
+        db.session.commit()
         
-        if existing:
+        if wishlist_id is None:
             return jsonify({'message': 'Product already in wishlist'}), 200
         
-        wishlist_item = Wishlist(
-            user_id=payload['user_id'],
-            product_id=product_id
-        )
-        
-        db.session.add(wishlist_item)
-        db.session.commit()
-        
         return jsonify({
             'message': 'Product added to wishlist',
             'wishlist_item': {
-                'id': wishlist_item.id,
-                'product_id': wishlist_item.product_id
+                'id': wishlist_id,
+                'product_id': product_id
             }
         }), 201
         
@@ -990,18 +1001,11 @@ def add_to_wishlist(product_id):
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/wishlist/<int:product_id>', methods=['DELETE'])
+@require_auth()
 def remove_from_wishlist(product_id):
     """Remove product from wishlist"""
     try:
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or not auth_header.startswith('Bearer '):
-            return jsonify({'error': 'Authorization required'}), 401
-        
-        token = auth_header.split(' ')[1]
-        payload = verify_token(token)
-        
-        if not payload:
-            return jsonify({'error': 'Invalid or expired token'}), 401
+        payload = request.auth_payload
         
         wishlist_item = Wishlist.query.filter_by(
             user_id=payload['user_id'],
@@ -1023,6 +1027,7 @@ def remove_from_wishlist(product_id):
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/ai/recipe-suggestions', methods=['POST'])
+@json_body(AI_BODY_LIMIT)
 def get_ai_recipe_suggestions():
     """Get AI-powered recipe suggestions based on cart items"""
     try:
@@ -1032,7 +1037,7 @@ def get_ai_recipe_suggestions():
                 'message': 'AI service temporarily unavailable'
             }), 200
         
-        data = request.get_json()
+        data = request.json_body
         
         if 'cart_items' not in data:
             return jsonify({'error': 'Cart items required'}), 400
@@ -1053,6 +1058,7 @@ def get_ai_recipe_suggestions():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/ai/product-recommendations', methods=['POST'])
+@json_body(AI_BODY_LIMIT)
 def get_ai_product_recommendations():
     """Get AI-powered product recommendations"""
     try:
@@ -1062,7 +1068,7 @@ def get_ai_product_recommendations():
                 'message': 'AI recommendations temporarily unavailable'
             }), 200
         
-        data = request.get_json()
+        data = request.json_body
         
         user_preferences = data.get('user_preferences', [])
         available_products = data.get('available_products', [])
@@ -1084,27 +1090,21 @@ def get_ai_product_recommendations():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/orders/<int:order_id>/review', methods=['POST'])
+@require_auth()
+@json_body(REVIEW_BODY_LIMIT)
 def submit_review(order_id):
     """Submit a review for a product in an order"""
     try:
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or not auth_header.startswith('Bearer '):
-            return jsonify({'error': 'Authorization required'}), 401
-        
-        token = auth_header.split(' ')[1]
-        payload = verify_token(token)
-        
-        if not payload:
-            return jsonify({'error': 'Invalid or expired token'}), 401
+        payload = request.auth_payload
         
-        order = Order.query.get(order_id)
+        order = db.session.get(Order, order_id)
         if not order:
             return jsonify({'error': 'Order not found'}), 404
         
         if order.user_id != payload['user_id']:
             return jsonify({'error': 'Unauthorized'}), 403
         
-        data = request.get_json()
+        data = request.json_body
         
         required_fields = ['product_id', 'rating', 'comment']
         for field in required_fields:
@@ -1118,7 +1118,7 @@ def submit_review(order_id):
         if not isinstance(rating, int) or rating < 1 or rating > 5:
             return jsonify({'error': 'Rating must be between 1 and 5'}), 400
         
-        product = Product.query.get(product_id)
+        product = db.session.get(Product, product_id)
         if not product:
             return jsonify({'error': 'Product not found'}), 404
         
@@ -1181,23 +1181,34 @@ def submit_review(order_id):
 def get_product_reviews(product_id):
     """Get all reviews for a product"""
     try:
-        product = Product.query.get(product_id)
+        product = db.session.get(Product, product_id)
         if not product:
             return jsonify({'error': 'Product not found'}), 404
         
-        reviews = Review.query.filter_by(product_id=product_id).order_by(Review.created_at.desc()).all()
-        
-        return jsonify({
+        # Reviewer names joined in; only the emitted columns are selected
+        reviews = db.session.query(
+            Review.id,
+            User.name,
+            Review.rating,
+            Review.comment,
+            Review.baker_reply,
+            Review.created_at,
+            Review.reply_at
+        ).join(User, User.id == Review.user_id).filter(
+            Review.product_id == product_id
+        ).order_by(Review.created_at.desc())
+        
+        return orjson_response({
             'reviews': [{
-                'id': review.id,
-                'user_name': review.user.name,
-                'rating': review.rating,
-                'comment': review.comment,
-                'baker_reply': review.baker_reply,
-                'created_at': review.created_at.isoformat(),
-                'reply_at': review.reply_at.isoformat() if review.reply_at else None
-            } for review in reviews]
-        }), 200
+                'id': review_id,
+                'user_name': user_name,
+                'rating': rating,
+                'comment': comment,
+                'baker_reply': baker_reply,
+                'created_at': created_at,
+                'reply_at': reply_at
+            } for review_id, user_name, rating, comment, baker_reply, created_at, reply_at in reviews]
+        })
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -1,13 +1,17 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime, timedelta
 import jwt
-import random
+import secrets
+import time
+from itertools import count
 import os
-import json
+import orjson
 from dotenv import load_dotenv
-from email_service import send_otp_email, send_order_confirmation
+from email_service import queue_otp_email, run_in_background, send_order_confirmation
+from password_service import hash_password, verify_password
+from token_service import encode_token
+from orjson_response import ORJSONProvider, json_body, read_json_object
 
 try:
     from sns_service import (
@@ -41,6 +45,7 @@ from razorpay_service import create_razorpay_order
 load_dotenv()
 
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 
 allowed_origins = os.getenv('CORS_ORIGINS', '*')
 if allowed_origins == '*':
@@ -50,26 +55,27 @@ else:
 
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'CHANGE-THIS-IN-PRODUCTION')
 
+# Caps on request bodies; cart and product lists for the AI routes are small
+AI_BODY_LIMIT = 256 * 1024
+REVIEW_BODY_LIMIT = 32 * 1024
+
 otp_storage = {}
 
 def generate_otp():
     """Generate a 6-digit OTP"""
-    return str(random.randint(100000, 999999))
+    return str(secrets.randbelow(900000) + 100000)
+
+# Per-process sequence appended to the order id timestamp, so ids issued by
+# one worker never collide even within the same clock tick
+_order_sequence = count()
 
 def generate_order_id():
     """Generate unique order ID"""
-    timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
-    random_part = random.randint(1000, 9999)
-    return f"LC{timestamp}{random_part}"
+    return f"LC{time.time_ns():X}{next(_order_sequence):X}"
 
 def create_token(user_id, user_type):
     """Create JWT token"""
-    payload = {
-        'user_id': user_id,
-        'user_type': user_type,
-        'exp': datetime.utcnow() + timedelta(days=7)
-    }
-    return jwt.encode(payload, app.config['SECRET_KEY'], algorithm='HS256')
+    return encode_token(user_id, user_type, app.config['SECRET_KEY'])
 
 def verify_token(token):
     """Verify JWT token"""
@@ -105,18 +111,14 @@ def register():
             user_id=user_id,
             name=data['name'],
             email=data['email'],
-            password_hash=generate_password_hash(data['password']),
+            password_hash=hash_password(data['password']),
             user_type=data['user_type']
         )
         
         token = create_token(user['id'], user['user_type'])
         
         if SNS_ENABLED:
-            try:
-                subscribe_email_to_notifications(user['email'])
-                print(f"📧 User {user['email']} subscribed to SNS notifications")
-            except Exception as e:
-                print(f"Warning: Failed to subscribe to SNS: {e}")
+            run_in_background(subscribe_email_to_notifications, user['email'])
         
         return jsonify({
             'message': 'User registered successfully',
@@ -143,7 +145,7 @@ def login():
         
         user = User.get_by_email(data['email'])
         
-        if not user or not check_password_hash(user['password_hash'], data['password']):
+        if not user or not verify_password(user['password_hash'], data['password']):
             return jsonify({'error': 'Invalid email or password'}), 401
         
         token = create_token(user['id'], user['user_type'])
@@ -194,7 +196,7 @@ def send_otp():
             'expires_at': datetime.utcnow() + timedelta(minutes=5)
         }
         
-        email_sent = send_otp_email(email, otp)
+        email_sent = queue_otp_email(email, otp)
         
         print(f"OTP for {email}: {otp}")
         
@@ -277,7 +279,7 @@ def register_baker():
             user_id=user_id,
             name=data['owner_name'],
             email=data['email'],
-            password_hash=generate_password_hash(data['password']),
+            password_hash=hash_password(data['password']),
             user_type='baker'
         )
         
@@ -476,6 +478,61 @@ def add_product():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def notify_order_placed(order, items, user_id, total_amount):
+    """Send the SNS order confirmation to the customer and new-order alerts to bakers"""
+    user = User.get_by_id(user_id)
+    
+    if user:
+        try:
+            items_for_notification = [{
+                'product_name': item['product_name'],
+                'quantity': item['quantity'],
+                'price': item['price']
+            } for item in items]
+            
+            sns_send_order_confirmation(
+                order_id=order['order_id'],
+                customer_email=user['email'],
+                customer_name=user['name'],
+                total_amount=total_amount,
+                items=items_for_notification
+            )
+            print(f"📧 SNS order confirmation sent to {user['email']}")
+        except Exception as e:
+            print(f"Warning: Failed to send SNS order confirmation: {e}")
+    
+    try:
+        baker_orders = {}
+        for item in items:
+            product = Product.get_by_id(item['product_id'])
+            if product:
+                baker_id = product['baker_id']
+                if baker_id not in baker_orders:
+                    baker_orders[baker_id] = []
+                baker_orders[baker_id].append({
+                    'product_name': item['product_name'],
+                    'quantity': item['quantity'],
+                    'price': item['price']
+                })
+        
+        for baker_id, baker_items in baker_orders.items():
+            baker = Baker.get_by_id(baker_id)
+            if baker:
+                baker_user = User.get_by_id(baker['user_id'])
+                if baker_user:
+                    baker_total = sum(item['price'] * item['quantity'] for item in baker_items)
+                    sns_notify_baker(
+                        baker_email=baker_user['email'],
+                        baker_name=baker['shop_name'],
+                        order_id=order['order_id'],
+                        customer_name=user['name'] if user else 'Customer',
+                        items=baker_items,
+                        total_amount=baker_total
+                    )
+                    print(f"📧 SNS baker notification sent to {baker['shop_name']}")
+    except Exception as e:
+        print(f"Warning: Failed to send SNS baker notifications: {e}")
+
 @app.route('/api/orders', methods=['POST'])
 def create_order():
     """Create a new order"""
@@ -507,7 +564,7 @@ def create_order():
             total_amount=data['total_amount'],
             status='pending',
             payment_status='pending',
-            delivery_address=json.dumps(data['delivery_address'])
+            delivery_address=orjson.dumps(data['delivery_address']).decode('utf-8')
         )
         
         items = []
@@ -539,60 +596,8 @@ def create_order():
         if not razorpay_result['success']:
             print(f"Razorpay order creation failed: {razorpay_result.get('error')}")
         
-        user = User.get_by_id(payload['user_id'])
-        
-        if SNS_ENABLED and user:
-            try:
-                items_for_notification = [{
-                    'product_name': item['product_name'],
-                    'quantity': item['quantity'],
-                    'price': item['price']
-                } for item in items]
-                
-                sns_send_order_confirmation(
-                    order_id=order['order_id'],
-                    customer_email=user['email'],
-                    customer_name=user['name'],
-                    total_amount=data['total_amount'],
-                    items=items_for_notification
-                )
-                print(f"📧 SNS order confirmation sent to {user['email']}")
-            except Exception as e:
-                print(f"Warning: Failed to send SNS order confirmation: {e}")
-        
-
         if SNS_ENABLED:
-            try:
-                baker_orders = {}
-                for item in items:
-                    product = Product.get_by_id(item['product_id'])
-                    if product:
-                        baker_id = product['baker_id']
-                        if baker_id not in baker_orders:
-                            baker_orders[baker_id] = []
-                        baker_orders[baker_id].append({
-                            'product_name': item['product_name'],
-                            'quantity': item['quantity'],
-                            'price': item['price']
-                        })
-                
-                for baker_id, baker_items in baker_orders.items():
-                    baker = Baker.get_by_id(baker_id)
-                    if baker:
-                        baker_user = User.get_by_id(baker['user_id'])
-                        if baker_user:
-                            baker_total = sum(item['price'] * item['quantity'] for item in baker_items)
-                            sns_notify_baker(
-                                baker_email=baker_user['email'],
-                                baker_name=baker['shop_name'],
-                                order_id=order['order_id'],
-                                customer_name=user['name'] if user else 'Customer',
-                                items=baker_items,
-                                total_amount=baker_total
-                            )
-                            print(f"📧 SNS baker notification sent to {baker['shop_name']}")
-            except Exception as e:
-                print(f"Warning: Failed to send SNS baker notifications: {e}")
+            run_in_background(notify_order_placed, order, items, payload['user_id'], data['total_amount'])
         
         response_data = {
             'id': order['id'],
@@ -758,7 +763,7 @@ def get_order_by_id(order_id):
             'total_amount': order['total_amount'],
             'status': order['status'],
             'payment_status': order['payment_status'],
-            'delivery_address': json.loads(order['delivery_address']),
+            'delivery_address': orjson.loads(order['delivery_address']),
             'created_at': order['created_at'],
             'items': [{
                 'product_id': item['product_id'],
@@ -1024,7 +1029,7 @@ def update_order_status(order_id):
         
         if SNS_ENABLED and new_status == 'out_for_delivery' and customer:
             try:
-                delivery_address = json.loads(order['delivery_address'])
+                delivery_address = orjson.loads(order['delivery_address'])
                 sns_send_delivery(
                     order_id=updated_order['order_id'],
                     customer_email=customer['email'],
@@ -1097,7 +1102,7 @@ def get_baker_orders():
                           if item['product_id'] in product_ids]
             
             try:
-                delivery_address = json.loads(order['delivery_address'])
+                delivery_address = orjson.loads(order['delivery_address'])
             except:
                 delivery_address = {}
             
@@ -1253,6 +1258,7 @@ def remove_from_wishlist(product_id):
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/ai/recipe-suggestions', methods=['POST'])
+@json_body(AI_BODY_LIMIT)
 def get_ai_recipe_suggestions():
     """Get AI-powered recipe suggestions based on cart items"""
     try:
@@ -1262,7 +1268,7 @@ def get_ai_recipe_suggestions():
                 'message': 'AI service temporarily unavailable'
             }), 200
         
-        data = request.get_json()
+        data = request.json_body
         
         if 'cart_items' not in data:
             return jsonify({'error': 'Cart items required'}), 400
@@ -1283,6 +1289,7 @@ def get_ai_recipe_suggestions():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/ai/product-recommendations', methods=['POST'])
+@json_body(AI_BODY_LIMIT)
 def get_ai_product_recommendations():
     """Get AI-powered product recommendations"""
     try:
@@ -1292,7 +1299,7 @@ def get_ai_product_recommendations():
                 'message': 'AI recommendations temporarily unavailable'
             }), 200
         
-        data = request.get_json()
+        data = request.json_body
         
         user_preferences = data.get('user_preferences', [])
         available_products = data.get('available_products', [])
@@ -1334,7 +1341,10 @@ def submit_review(order_id):
         if order['user_id'] != payload['user_id']:
             return jsonify({'error': 'Unauthorized'}), 403
         
-        data = request.get_json()
+        # Parsed only once the caller is known to be the order's owner
+        data, error = read_json_object(REVIEW_BODY_LIMIT)
+        if error:
+            return error
         
         required_fields = ['product_id', 'rating', 'comment']
         for field in required_fields:
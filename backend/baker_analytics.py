@@ -7,19 +7,13 @@ from flask import Blueprint, request, jsonify, current_app
 from datetime import datetime, timedelta
 from sqlalchemy import func, desc
 from database import db, Baker, Product, Order, OrderItem, Review, User
-import jwt
+from token_service import decode_token
 
 baker_analytics_bp = Blueprint('baker_analytics', __name__)
 
 def verify_token(token):
     """Verify JWT token"""
-    try:
-        payload = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=['HS256'])
-        return payload
-    except jwt.ExpiredSignatureError:
-        return None
-    except jwt.InvalidTokenError:
-        return None
+    return decode_token(token, current_app.config['SECRET_KEY'])
 
 def verify_baker_token(request):
     """Helper function to verify baker authentication"""
@@ -33,11 +27,8 @@ def verify_baker_token(request):
     if not payload or payload.get('user_type') != 'baker':
         return None
     
-    user = User.query.get(payload['user_id'])
-    if not user or not user.baker_profile:
-        return None
-    
-    return user.baker_profile
+    # The baker row directly, instead of the User and then its baker_profile
+    return Baker.query.filter_by(user_id=payload['user_id']).first()
 
 CURRENCY_SYMBOL = '₹'  
 CURRENCY_CODE = 'INR'
@@ -274,9 +265,9 @@ def get_inventory():
         
         products = Product.query.filter_by(baker_id=baker.id).all()
         
+        week_ago = datetime.utcnow() - timedelta(days=7)
         inventory_data = []
         for product in products:
-            week_ago = datetime.utcnow() - timedelta(days=7)
             weekly_sales = db.session.query(
                 func.sum(OrderItem.quantity)
             ).join(Order).filter(
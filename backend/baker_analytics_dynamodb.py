@@ -5,6 +5,8 @@ Adds analytics, reviews, inventory management, and more for baker dashboard
 
 from flask import Blueprint, request, jsonify, current_app
 from datetime import datetime, timedelta
+from operator import itemgetter
+import heapq
 import jwt
 from dynamodb_database import (
     User, Baker, Product, Order, OrderItem, Review, 
@@ -150,11 +152,7 @@ def get_top_products():
                     product_sales[product_id]['total_revenue'] += price * quantity
                     product_sales[product_id]['order_count'] += 1
         
-        top_products = sorted(
-            product_sales.values(),
-            key=lambda x: x['total_revenue'],
-            reverse=True
-        )[:limit]
+        top_products = heapq.nlargest(limit, product_sales.values(), key=itemgetter('total_revenue'))
         
         return jsonify({
             'top_products': top_products,
@@ -297,15 +295,20 @@ def get_customer_insights():
         repeat_customers = len([uid for uid, orders in user_orders.items() if len(orders) > 1])
         avg_order_value = total_revenue / sum(len(orders) for orders in user_orders.values()) if user_orders else 0
         
+        total_spent = {
+            user_id: sum(float(o['total_amount']) for o in orders)
+            for user_id, orders in user_orders.items()
+        }
+        
         top_customers_data = []
-        for user_id, orders in sorted(user_orders.items(), key=lambda x: sum(float(o['total_amount']) for o in x[1]), reverse=True)[:5]:
+        for user_id in heapq.nlargest(5, total_spent, key=total_spent.get):
             user = User.get_by_id(user_id)
             if user:
                 top_customers_data.append({
                     'name': user['name'],
                     'email': user['email'],
-                    'order_count': len(orders),
-                    'total_spent': sum(float(o['total_amount']) for o in orders)
+                    'order_count': len(user_orders[user_id]),
+                    'total_spent': total_spent[user_id]
                 })
         
         return jsonify({
@@ -333,10 +336,9 @@ def get_inventory():
         
         products = Product.get_by_baker_id(baker['id'])
         
+        week_ago = datetime.utcnow() - timedelta(days=7)
         inventory_data = []
         for product in products:
-            week_ago = datetime.utcnow() - timedelta(days=7)
-            
             response = order_items_table.scan(
                 FilterExpression='product_id = :pid',
                 ExpressionAttributeValues={':pid': product['id']}
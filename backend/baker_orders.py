@@ -4,19 +4,12 @@ Additional Baker Routes for Orders, Reviews, and Status Updates
 
 from flask import Blueprint, request, jsonify, current_app
 from datetime import datetime
-import json
 from database import db, Baker, Product, Order, OrderItem, Review, User, Notification
-import jwt
+from token_service import decode_token
 
 def verify_token(token):
     """Verify JWT token"""
-    try:
-        payload = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=['HS256'])
-        return payload
-    except jwt.ExpiredSignatureError:
-        return None
-    except jwt.InvalidTokenError:
-        return None
+    return decode_token(token, current_app.config['SECRET_KEY'])
 
 baker_orders_bp = Blueprint('baker_orders', __name__)
 
@@ -35,11 +28,8 @@ def verify_baker_token_local(request):
     if not payload or payload.get('user_type') != 'baker':
         return None
     
-    user = User.query.get(payload['user_id'])
-    if not user or not user.baker_profile:
-        return None
-    
-    return user.baker_profile
+    # The baker row directly, instead of the User and then its baker_profile
+    return Baker.query.filter_by(user_id=payload['user_id']).first()
 
 @baker_orders_bp.route('/baker/orders', methods=['GET'])
 def get_baker_orders():
@@ -63,8 +53,8 @@ def get_baker_orders():
         
         formatted_orders = []
         for order in orders:
-            customer = User.query.get(order.user_id)
-            delivery_addr = json.loads(order.delivery_address)
+            customer = db.session.get(User, order.user_id)
+            delivery_addr = order.delivery_address
         
             baker_items = [item for item in order.items if item.product_id in product_ids]
             
@@ -122,7 +112,7 @@ def update_baker_order_status(order_id):
         if new_status not in valid_statuses:
             return jsonify({'error': f'Invalid status: {new_status}. Valid statuses are: {", ".join(valid_statuses)}'}), 400
         
-        order = Order.query.get(order_id)
+        order = db.session.get(Order, order_id)
         if not order:
             print(f"Order {order_id} not found in database")
             return jsonify({'error': 'Order not found'}), 404
@@ -188,7 +178,7 @@ def reply_to_review(review_id):
         if not baker:
             return jsonify({'error': 'Unauthorized'}), 401
         
-        review = Review.query.get(review_id)
+        review = db.session.get(Review, review_id)
         if not review:
             return jsonify({'error': 'Review not found'}), 404
         
@@ -204,7 +194,7 @@ def reply_to_review(review_id):
         review.baker_reply = reply
         review.reply_at = datetime.utcnow()
         
-        product = Product.query.get(review.product_id)
+        product = db.session.get(Product, review.product_id)
         notification = Notification(
             user_id=review.user_id,
             title=f"{baker.shop_name} replied to your review",
@@ -240,12 +230,13 @@ def get_baker_reviews():
             Review.baker_id == baker.id
         ).order_by(Review.created_at.desc()).all()
         
+        now = datetime.utcnow()
         formatted_reviews = []
         for review in reviews:
-            customer = User.query.get(review.user_id)
-            product = Product.query.get(review.product_id)
+            customer = db.session.get(User, review.user_id)
+            product = db.session.get(Product, review.product_id)
             
-            time_diff = datetime.utcnow() - review.created_at
+            time_diff = now - review.created_at
             if time_diff.days > 0:
                 time_ago = f"{time_diff.days} days ago"
             elif time_diff.seconds // 3600 > 0:
@@ -319,7 +310,7 @@ def add_order_review():
         if not payload:
             return jsonify({'error': 'Invalid or expired token'}), 401
         
-        order = Order.query.get(order_id)
+        order = db.session.get(Order, order_id)
         if not order:
             return jsonify({'error': 'Order not found'}), 404
         
@@ -341,7 +332,7 @@ def add_order_review():
         if not (1 <= rating <= 5):
             return jsonify({'error': 'Rating must be between 1 and 5'}), 400
         
-        product = Product.query.get(product_id)
+        product = db.session.get(Product, product_id)
         if not product:
             return jsonify({'error': 'Product not found'}), 404
         
@@ -4,7 +4,7 @@ Additional Baker Routes for Orders, Reviews, and Status Updates - DynamoDB Versi
 
 from flask import Blueprint, request, jsonify, current_app
 from datetime import datetime
-import json
+import orjson
 import jwt
 from dynamodb_database import (
     User, Baker, Product, Order, OrderItem, Review, Notification,
@@ -78,7 +78,7 @@ def get_baker_orders():
             customer = User.get_by_id(order['user_id'])
             
             try:
-                delivery_addr = json.loads(order['delivery_address'])
+                delivery_addr = orjson.loads(order['delivery_address'])
             except:
                 delivery_addr = {}
             
@@ -274,13 +274,14 @@ def get_baker_reviews():
         
         reviews.sort(key=lambda x: x['created_at'], reverse=True)
         
+        now = datetime.utcnow()
         formatted_reviews = []
         for review in reviews:
             customer = User.get_by_id(review['user_id'])
             product = Product.get_by_id(review['product_id'])
             
             created_at = datetime.fromisoformat(review['created_at'])
-            time_diff = datetime.utcnow() - created_at
+            time_diff = now - created_at
             if time_diff.days > 0:
                 time_ago = f"{time_diff.days} days ago"
             elif time_diff.seconds // 3600 > 0:
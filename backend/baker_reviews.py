@@ -8,9 +8,10 @@ print("*"*70 + "\n")
 
 from flask import Blueprint, request, jsonify
 from database import db, Review, Product, User, Notification
+from sqlalchemy.orm import joinedload
 from datetime import datetime
-import jwt
 import os
+from token_service import decode_token
 
 baker_reviews_bp = Blueprint('baker_reviews', __name__)
 
@@ -25,14 +26,8 @@ def test_route():
 
 def verify_token(token):
     """Verify JWT token"""
-    try:
-        secret_key = os.getenv('SECRET_KEY', 'your-secret-key-change-in-production')
-        payload = jwt.decode(token, secret_key, algorithms=['HS256'])
-        return payload
-    except jwt.ExpiredSignatureError:
-        return None
-    except jwt.InvalidTokenError:
-        return None
+    secret_key = os.getenv('SECRET_KEY', 'your-secret-key-change-in-production')
+    return decode_token(token, secret_key)
 
 print("About to define get_baker_reviews route...", flush=True)
 
@@ -54,7 +49,7 @@ def get_baker_reviews():
         if not payload or payload.get('user_type') != 'baker':
             return jsonify({'error': 'Invalid or expired token'}), 401
         
-        user = User.query.get(payload['user_id'])
+        user = db.session.get(User, payload['user_id'], options=[joinedload(User.baker_profile)])
         if not user or not user.baker_profile:
             return jsonify({'error': 'Baker profile not found'}), 404
         
@@ -118,7 +113,7 @@ def get_review_stats():
         if not payload or payload.get('user_type') != 'baker':
             return jsonify({'error': 'Invalid or expired token'}), 401
         
-        user = User.query.get(payload['user_id'])
+        user = db.session.get(User, payload['user_id'], options=[joinedload(User.baker_profile)])
         if not user or not user.baker_profile:
             return jsonify({'error': 'Baker profile not found'}), 404
         
@@ -173,13 +168,13 @@ def reply_to_review(review_id):
         if not payload or payload.get('user_type') != 'baker':
             return jsonify({'error': 'Invalid or expired token'}), 401
         
-        user = User.query.get(payload['user_id'])
+        user = db.session.get(User, payload['user_id'], options=[joinedload(User.baker_profile)])
         if not user or not user.baker_profile:
             return jsonify({'error': 'Baker profile not found'}), 404
         
         baker = user.baker_profile
         
-        review = Review.query.get(review_id)
+        review = db.session.get(Review, review_id)
         if not review:
             return jsonify({'error': 'Review not found'}), 404
         
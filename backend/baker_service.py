@@ -0,0 +1,32 @@
+"""
+Cached lookup of a user's baker profile id
+Every baker route starts from the token's user id; the mapping only changes
+when a baker is removed, so it is kept in the shared cache
+"""
+from cache_service import cache_get, cache_set, cache_delete
+from database import db, Baker
+
+BAKER_ID_TTL = 300
+
+def baker_id_cache_key(user_id):
+    """Cache key for a user's baker id"""
+    return f'baker_id:{user_id}'
+
+def get_baker_id(user_id):
+    """
+    Return the id of the user's baker profile, or None if they have none
+    Only found ids are cached, so a newly registered baker is seen at once
+    """
+    key = baker_id_cache_key(user_id)
+    cached = cache_get(key)
+    if cached:
+        return int(cached)
+
+    baker_id = db.session.query(Baker.id).filter(Baker.user_id == user_id).scalar()
+    if baker_id:
+        cache_set(key, str(baker_id).encode('utf-8'), BAKER_ID_TTL)
+    return baker_id
+
+def forget_baker_id(user_id):
+    """Drop a user's cached baker id after their baker profile is removed"""
+    cache_delete(baker_id_cache_key(user_id))
@@ -0,0 +1,182 @@
+"""
+Short-lived cache for computed responses
+Uses Redis when REDIS_URL is configured, otherwise an in-process cache
+"""
+import os
+import time
+import threading
+from itertools import chain
+from cachetools import TLRUCache
+from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+load_dotenv()
+
+REDIS_URL = os.getenv('REDIS_URL', '')
+
+redis_client = None
+if REDIS_URL:
+    try:
+        import redis
+        redis_client = redis.Redis.from_url(REDIS_URL)
+    except ImportError:
+        print("⚠️  redis package not installed, using in-process cache")
+
+# Fallback store: key -> (ttl, value). Each entry expires after its own ttl
+# (expired entries are swept on every write) and the least recently used
+# are evicted once LOCAL_CACHE_MAXSIZE is reached
+LOCAL_CACHE_MAXSIZE = 10000
+_local_cache = TLRUCache(
+    maxsize=LOCAL_CACHE_MAXSIZE,
+    ttu=lambda _key, entry, now: now + entry[0],
+    timer=time.monotonic
+)
+_local_cache_lock = threading.Lock()
+
+def cache_get(key: str):
+    """
+    Get a cached value
+
+    Returns:
+        bytes or None if missing, expired or the cache is unreachable
+    """
+    if redis_client:
+        try:
+            return redis_client.get(key)
+        except Exception as e:
+            print(f"Cache get failed: {e}")
+            return None
+
+    with _local_cache_lock:
+        entry = _local_cache.get(key)
+    return entry[1] if entry else None
+
+def cache_set(key: str, value: bytes, ttl: int) -> None:
+    """Store a value for ttl seconds"""
+    if redis_client:
+        try:
+            redis_client.set(key, value, ex=ttl)
+        except Exception as e:
+            print(f"Cache set failed: {e}")
+        return
+
+    with _local_cache_lock:
+        _local_cache[key] = (ttl, value)
+
+def cache_pop(key: str):
+    """
+    Get a cached value and delete it in one atomic step, so only one
+    caller can ever receive it
+
+    Returns:
+        bytes or None if missing, expired or the cache is unreachable
+    """
+    if redis_client:
+        try:
+            return redis_client.getdel(key)
+        except Exception as e:
+            print(f"Cache pop failed: {e}")
+            return None
+
+    with _local_cache_lock:
+        entry = _local_cache.pop(key, None)
+    return entry[1] if entry else None
+
+def cache_get_many(keys: list) -> list:
+    """
+    Get several cached values in one round trip
+
+    Returns:
+        list of bytes or None, in the order of keys
+    """
+    if not keys:
+        return []
+    if redis_client:
+        try:
+            return redis_client.mget(keys)
+        except Exception as e:
+            print(f"Cache get failed: {e}")
+            return [None] * len(keys)
+
+    with _local_cache_lock:
+        entries = [_local_cache.get(key) for key in keys]
+    return [entry[1] if entry else None for entry in entries]
+
+def cache_set_many(values: dict, ttl: int) -> None:
+    """Store several key -> value pairs for ttl seconds in one round trip"""
+    if not values:
+        return
+    if redis_client:
+        try:
+            pipeline = redis_client.pipeline(transaction=False)
+            for key, value in values.items():
+                pipeline.set(key, value, ex=ttl)
+            pipeline.execute()
+        except Exception as e:
+            print(f"Cache set failed: {e}")
+        return
+
+    with _local_cache_lock:
+        for key, value in values.items():
+            _local_cache[key] = (ttl, value)
+
+def cache_delete(*keys: str) -> None:
+    """Drop cached values so the next read recomputes them"""
+    if redis_client:
+        try:
+            redis_client.delete(*keys)
+        except Exception as e:
+            print(f"Cache delete failed: {e}")
+        return
+
+    with _local_cache_lock:
+        for key in keys:
+            _local_cache.pop(key, None)
+
+# Cached responses and the models whose committed changes make them stale
+_invalidated_by = {}
+
+def invalidate_on_commit(key: str, *models) -> None:
+    """Drop key after any commit that adds, changes or deletes one of models"""
+    _invalidated_by[key] = models
+
+# Per-row cached values: model -> callable returning the cache keys of one row
+_row_keys = {}
+
+def invalidate_rows_on_commit(model, keys_for) -> None:
+    """Drop keys_for(obj) after any commit that changes or deletes an obj of model"""
+    _row_keys[model] = keys_for
+
+def invalidate_models(*models) -> None:
+    """
+    Drop every cached response that depends on models
+    Bulk statements bypass the unit of work, so routes using them call this
+    after committing
+    """
+    stale = [key for key, deps in _invalidated_by.items() if any(m in deps for m in models)]
+    if stale:
+        cache_delete(*stale)
+
+@event.listens_for(Session, 'after_flush')
+def _mark_cached_responses_stale(session, flush_context):
+    """Record which cached responses a flush has made stale"""
+    changed = list(chain(session.new, session.dirty, session.deleted))
+    for key, models in _invalidated_by.items():
+        if any(isinstance(obj, models) for obj in changed):
+            session.info.setdefault('stale_cache_keys', set()).add(key)
+    for model, keys_for in _row_keys.items():
+        for obj in chain(session.dirty, session.deleted):
+            if isinstance(obj, model):
+                session.info.setdefault('stale_cache_keys', set()).update(keys_for(obj))
+
+@event.listens_for(Session, 'after_commit')
+def _drop_stale_cached_responses(session):
+    """Drop stale cached responses once the changes are committed"""
+    stale = session.info.pop('stale_cache_keys', None)
+    if stale:
+        cache_delete(*stale)
+
+@event.listens_for(Session, 'after_rollback')
+def _clear_stale_cache_keys(session):
+    session.info.pop('stale_cache_keys', None)
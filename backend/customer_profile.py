@@ -3,21 +3,15 @@ Customer Profile Management Endpoints
 """
 
 from flask import Blueprint, request, jsonify, current_app
-import json
+import orjson
 from database import db, User
-import jwt
+from token_service import decode_token
 
 customer_profile_bp = Blueprint('customer_profile', __name__)
 
 def verify_token(token):
     """Verify JWT token"""
-    try:
-        payload = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=['HS256'])
-        return payload
-    except jwt.ExpiredSignatureError:
-        return None
-    except jwt.InvalidTokenError:
-        return None
+    return decode_token(token, current_app.config['SECRET_KEY'])
 
 @customer_profile_bp.route('/customer/profile', methods=['GET'])
 def get_customer_profile():
@@ -33,14 +27,14 @@ def get_customer_profile():
         if not payload:
             return jsonify({'error': 'Invalid or expired token'}), 401
         
-        user = User.query.get(payload['user_id'])
+        user = db.session.get(User, payload['user_id'])
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
         saved_address = None
         if user.saved_address:
             try:
-                saved_address = json.loads(user.saved_address)
+                saved_address = orjson.loads(user.saved_address)
             except:
                 saved_address = None
         
@@ -70,7 +64,7 @@ def save_customer_address():
         if not payload:
             return jsonify({'error': 'Invalid or expired token'}), 401
         
-        user = User.query.get(payload['user_id'])
+        user = db.session.get(User, payload['user_id'])
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
@@ -81,7 +75,7 @@ def save_customer_address():
             if field not in data:
                 return jsonify({'error': f'Missing required field: {field}'}), 400
         
-        user.saved_address = json.dumps(data)
+        user.saved_address = orjson.dumps(data).decode('utf-8')
         db.session.commit()
         
         return jsonify({
@@ -107,7 +101,7 @@ def update_customer_profile():
         if not payload:
             return jsonify({'error': 'Invalid or expired token'}), 401
         
-        user = User.query.get(payload['user_id'])
+        user = db.session.get(User, payload['user_id'])
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
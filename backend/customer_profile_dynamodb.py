@@ -3,7 +3,7 @@ Customer Profile Management Endpoints - DynamoDB Version
 """
 
 from flask import Blueprint, request, jsonify, current_app
-import json
+import orjson
 import jwt
 from dynamodb_database import User
 
@@ -40,7 +40,7 @@ def get_customer_profile():
         saved_address = None
         if user.get('saved_address'):
             try:
-                saved_address = json.loads(user['saved_address'])
+                saved_address = orjson.loads(user['saved_address'])
             except:
                 saved_address = None
         
@@ -81,7 +81,7 @@ def save_customer_address():
             if field not in data:
                 return jsonify({'error': f'Missing required field: {field}'}), 400
         
-        User.update(payload['user_id'], saved_address=json.dumps(data))
+        User.update(payload['user_id'], saved_address=orjson.dumps(data).decode('utf-8'))
         
         return jsonify({
             'message': 'Address saved successfully',
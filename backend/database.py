@@ -2,11 +2,35 @@
 Database configuration and models
 """
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, inspect, delete, update, select, func
+from sqlalchemy.engine import Engine
 from datetime import datetime
+import sqlite3
 
 # Initialize SQLAlchemy instance
 db = SQLAlchemy()
 
+# WAL lets readers run alongside the single writer and syncs on checkpoint
+# rather than every commit; NORMAL sync is safe in WAL mode. 64 MB page cache
+# and 256 MB memory-mapped reads.
+SQLITE_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA cache_size=-65536',
+    'PRAGMA mmap_size=268435456',
+    'PRAGMA temp_store=MEMORY',
+)
+
+@event.listens_for(Engine, 'connect')
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune each new SQLite connection; other databases are left alone"""
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
 # Models
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -22,6 +46,10 @@ class User(db.Model):
     baker_profile = db.relationship('Baker', backref='user', uselist=False, cascade='all, delete-orphan')
     orders = db.relationship('Order', backref='user', lazy=True)
 
+    __table_args__ = (
+        db.Index('ix_user_user_type', user_type),
+    )
+
 class Baker(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
@@ -46,6 +74,12 @@ class Baker(db.Model):
     # Relationships
     products = db.relationship('Product', backref='baker', lazy=True, cascade='all, delete-orphan')
 
+    __table_args__ = (
+        db.Index('ix_baker_verified', verified),
+        # Baker routes resolve the baker from the token's user id
+        db.Index('ix_baker_user', user_id),
+    )
+
 class Product(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     baker_id = db.Column(db.Integer, db.ForeignKey('baker.id'), nullable=False)
@@ -57,6 +91,11 @@ class Product(db.Model):
     in_stock = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        # A baker's products, and the public listing's in-stock filter per baker
+        db.Index('ix_product_baker_stock', baker_id, in_stock),
+    )
+
 class Order(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     order_id = db.Column(db.String(50), unique=True, nullable=False)
@@ -66,12 +105,25 @@ class Order(db.Model):
     status = db.Column(db.String(50), default='pending')
     payment_status = db.Column(db.String(50), default='pending')  # pending, completed, failed
     payment_id = db.Column(db.String(200))
-    delivery_address = db.Column(db.Text, nullable=False)
+    # Stored as JSON text; existing rows written with json.dumps read back unchanged
+    delivery_address = db.Column(db.JSON, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    items = db.relationship('OrderItem', backref='order', lazy=True, cascade='all, delete-orphan')
+    # Explicit order so items keep their insertion order whichever index is used
+    items = db.relationship('OrderItem', backref='order', lazy=True, cascade='all, delete-orphan', order_by='OrderItem.id')
+
+    __table_args__ = (
+        # Admin order listing: optional status filter, newest first
+        # id breaks created_at ties in the listing's keyset cursor
+        db.Index('ix_order_status_created_id', status, created_at.desc(), id.desc()),
+        db.Index('ix_order_created_id', created_at.desc(), id.desc()),
+        # Revenue and sales report aggregates over completed payments
+        db.Index('ix_order_payment_status_created', payment_status, created_at.desc()),
+        # Customer order history, newest first
+        db.Index('ix_order_user_created', user_id, created_at.desc()),
+    )
 
 class OrderItem(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -85,6 +137,13 @@ class OrderItem(db.Model):
     # Relationships
     product = db.relationship('Product')
 
+    __table_args__ = (
+        # Order.items loading and the per-order product check on review submit
+        db.Index('ix_orderitem_order_product', order_id, product_id),
+        # Per-product sales lookups
+        db.Index('ix_orderitem_product', product_id),
+    )
+
 class Review(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
@@ -101,6 +160,14 @@ class Review(db.Model):
     product = db.relationship('Product', backref='reviews')
     baker = db.relationship('Baker', backref='reviews')
 
+    __table_args__ = (
+        db.Index('ix_review_created_id', created_at.desc(), id.desc()),
+        # One review per customer and product; submitting again updates it
+        db.Index('ix_review_user_product', user_id, product_id, unique=True),
+        # A product's reviews, newest first
+        db.Index('ix_review_product_created', product_id, created_at.desc()),
+    )
+
 class Wishlist(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
@@ -111,6 +178,11 @@ class Wishlist(db.Model):
     user = db.relationship('User', backref='wishlist')
     product = db.relationship('Product')
 
+    __table_args__ = (
+        # A customer's wishlist, and the duplicate check when adding to it
+        db.Index('ix_wishlist_user_product', user_id, product_id, unique=True),
+    )
+
 class LoyaltyPoints(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, unique=True)
@@ -176,3 +248,87 @@ class Payment(db.Model):
     
     # Relationships
     order = db.relationship('Order', backref='payment_transactions')
+
+    __table_args__ = (
+        db.Index('ix_payment_created_id', created_at.desc(), id.desc()),
+    )
+
+# Row kept per group when duplicates block a unique index: the earliest
+# wishlist entry and the latest review, as resubmitting now updates it
+DUPLICATE_ROW_KEPT = {
+    'ix_wishlist_user_product': func.min,
+    'ix_review_user_product': func.max,
+}
+
+def _index_named(name):
+    """Model index with the given name"""
+    return next(
+        index
+        for table in db.metadata.sorted_tables
+        for index in table.indexes
+        if index.name == name
+    )
+
+def _has_duplicates(connection, index):
+    """Whether existing rows already share the columns of a unique index"""
+    return connection.execute(
+        select(func.count()).select_from(index.table).group_by(*index.columns).having(func.count() > 1).limit(1)
+    ).first() is not None
+
+def find_duplicate_rows(connection):
+    """
+    Rows blocking the unique indexes, other than the one kept per group
+
+    Returns:
+        dict of index name -> list of row mappings that would be deleted
+    """
+    found = {}
+    for name, keep in DUPLICATE_ROW_KEPT.items():
+        index = _index_named(name)
+        table = index.table
+        kept = select(keep(table.c.id)).group_by(*index.columns)
+        rows = connection.execute(
+            select(table).where(table.c.id.not_in(kept)).order_by(table.c.id)
+        ).mappings().all()
+        if rows:
+            found[name] = rows
+    return found
+
+def delete_duplicate_rows(connection, found):
+    """
+    Delete rows returned by find_duplicate_rows
+    Notifications about a deleted review lose their link to it
+    """
+    for name, rows in found.items():
+        table = _index_named(name).table
+        ids = [row['id'] for row in rows]
+        if table is Review.__table__:
+            connection.execute(
+                update(Notification).where(Notification.related_review_id.in_(ids)).values(related_review_id=None)
+            )
+        connection.execute(delete(table).where(table.c.id.in_(ids)))
+
+def upgrade_indexes():
+    """
+    Create model indexes missing from an existing database
+    db.create_all() only builds indexes along with new tables. A unique
+    index is not created while duplicate rows remain; those are reviewed
+    and removed with the remove-duplicate-rows command
+    """
+    with db.engine.begin() as connection:
+        inspector = inspect(connection)
+        existing = {
+            index['name']
+            for table in db.metadata.sorted_tables
+            for index in inspector.get_indexes(table.name)
+        }
+        
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                if index.name in existing:
+                    continue
+                if index.unique and _has_duplicates(connection, index):
+                    print(f"⚠️  Not creating {index.name}: duplicate rows remain. "
+                          f"Run 'flask remove-duplicate-rows' to review them")
+                    continue
+                index.create(connection)
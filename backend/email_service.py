@@ -5,6 +5,7 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -14,6 +15,10 @@ SMTP_PORT = int(os.getenv('SMTP_PORT', 587))
 SMTP_EMAIL = os.getenv('SMTP_EMAIL', '')
 SMTP_PASSWORD = os.getenv('SMTP_PASSWORD', '')
 
+# SMTP and SNS round-trips run on this pool so request threads don't wait on them
+EMAIL_WORKERS = int(os.getenv('EMAIL_WORKERS', '4'))
+_email_executor = ThreadPoolExecutor(max_workers=EMAIL_WORKERS, thread_name_prefix='smtp')
+
 def send_otp_email(to_email: str, otp: str) -> bool:
     """
     Send OTP via email
@@ -133,3 +138,29 @@ def send_order_confirmation(to_email: str, order_id: str, total_amount: float) -
     except Exception as e:
         print(f"❌ Failed to send order confirmation: {e}")
         return False
+
+def queue_otp_email(to_email: str, otp: str) -> bool:
+    """
+    Send OTP via email in the background
+    
+    Returns:
+        True if the email was queued, False if SMTP is not configured
+    """
+    if not SMTP_EMAIL or not SMTP_PASSWORD:
+        print("⚠️  SMTP not configured. OTP:", otp)
+        return False
+    
+    run_in_background(send_otp_email, to_email, otp)
+    return True
+
+def _log_background_error(future):
+    """Print the exception of a failed background notification"""
+    error = future.exception()
+    if error is not None:
+        print(f"❌ Background notification failed: {error}")
+
+def run_in_background(func, *args, **kwargs):
+    """Run a notification call on the email pool without waiting for it"""
+    future = _email_executor.submit(func, *args, **kwargs)
+    future.add_done_callback(_log_background_error)
+    return future
@@ -5,18 +5,12 @@ Handles notification retrieval, marking as read, and notification creation
 
 from flask import Blueprint, request, jsonify, current_app
 from datetime import datetime
-import jwt
+from token_service import decode_token
 from database import db, Notification, User, Review
 
 def verify_token(token):
     """Verify JWT token"""
-    try:
-        payload = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=['HS256'])
-        return payload
-    except jwt.ExpiredSignatureError:
-        return None
-    except jwt.InvalidTokenError:
-        return None
+    return decode_token(token, current_app.config['SECRET_KEY'])
 
 notification_bp = Blueprint('notifications', __name__)
 
@@ -32,7 +26,7 @@ def get_authenticated_user():
     if not payload:
         return None
     
-    user = User.query.get(payload['user_id'])
+    user = db.session.get(User, payload['user_id'])
     return user
 
 @notification_bp.route('/notifications', methods=['GET'])
@@ -87,7 +81,7 @@ def mark_notification_as_read(notification_id):
         if not user:
             return jsonify({'error': 'Unauthorized'}), 401
         
-        notification = Notification.query.get(notification_id)
+        notification = db.session.get(Notification, notification_id)
         if not notification:
             return jsonify({'error': 'Notification not found'}), 404
         
@@ -159,7 +153,7 @@ def delete_notification(notification_id):
         if not user:
             return jsonify({'error': 'Unauthorized'}), 401
         
-        notification = Notification.query.get(notification_id)
+        notification = db.session.get(Notification, notification_id)
         if not notification:
             return jsonify({'error': 'Notification not found'}), 404
         
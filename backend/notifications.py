@@ -4,18 +4,12 @@ Notification Routes and Management
 
 from flask import Blueprint, request, jsonify, current_app
 from datetime import datetime
-import jwt
+from token_service import decode_token
 from database import db, User, Notification, Review
 
 def verify_token(token):
     """Verify JWT token"""
-    try:
-        payload = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=['HS256'])
-        return payload
-    except jwt.ExpiredSignatureError:
-        return None
-    except jwt.InvalidTokenError:
-        return None
+    return decode_token(token, current_app.config['SECRET_KEY'])
 
 notifications_bp = Blueprint('notifications', __name__)
 
@@ -102,7 +96,7 @@ def mark_notification_as_read(notification_id):
         if not payload:
             return jsonify({'error': 'Invalid or expired token'}), 401
         
-        notification = Notification.query.get(notification_id)
+        notification = db.session.get(Notification, notification_id)
         
         if not notification:
             return jsonify({'error': 'Notification not found'}), 404
@@ -164,7 +158,7 @@ def delete_notification(notification_id):
         if not payload:
             return jsonify({'error': 'Invalid or expired token'}), 401
         
-        notification = Notification.query.get(notification_id)
+        notification = db.session.get(Notification, notification_id)
         
         if not notification:
             return jsonify({'error': 'Notification not found'}), 404
@@ -0,0 +1,161 @@
+"""
+Fast JSON request parsing and responses backed by orjson
+"""
+from datetime import date
+import hashlib
+from decimal import Decimal
+from functools import wraps
+import uuid
+from flask import current_app, request, stream_with_context
+from flask.json.provider import JSONProvider
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.http import http_date
+import orjson
+
+# Naive datetimes serialize exactly like datetime.isoformat(), and integer
+# keys are stringified the same way jsonify does.
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+# Marks an empty stream in orjson_stream_response
+_NO_ROWS = object()
+
+def get_json_body():
+    """Parse the request body with orjson; None when the body is empty"""
+    raw = request.get_data(cache=False)
+    return orjson.loads(raw) if raw else None
+
+def read_json_object(max_bytes: int):
+    """
+    Read and parse a request body that must be a JSON object of at most max_bytes
+
+    Returns:
+        (data, None), or (None, error response) for a 413 or 400
+    """
+    # Werkzeug refuses a larger Content-Length up front and stops reading
+    # bodies without one (chunked) at this limit, so at most one byte past
+    # the cap is ever buffered
+    request.max_content_length = max_bytes + 1
+    try:
+        raw = request.get_data(cache=False)
+    except RequestEntityTooLarge:
+        raw = None
+    if raw is None or len(raw) > max_bytes:
+        return None, orjson_response({'error': 'Request body too large'}, 413)
+    
+    try:
+        data = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return None, orjson_response({'error': 'Invalid JSON body'}, 400)
+    if not isinstance(data, dict):
+        return None, orjson_response({'error': 'Request body must be a JSON object'}, 400)
+    return data, None
+
+def json_body(max_bytes: int):
+    """
+    Parse the request body with read_json_object before the route runs,
+    answering 413 or 400 instead of calling it
+    The parsed object is available to the route as request.json_body
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            data, error = read_json_object(max_bytes)
+            if error:
+                return error
+            request.json_body = data
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
+
+def orjson_dumps(data) -> bytes:
+    """Serialize data to JSON bytes with the shared options"""
+    return orjson.dumps(data, option=ORJSON_OPTIONS)
+
+def json_bytes_response(body: bytes, status=200):
+    """Wrap an already-serialized JSON body in a response"""
+    return current_app.response_class(body, status=status, mimetype='application/json')
+
+def public_json_response(body: bytes, max_age: int):
+    """
+    Wrap a JSON body that any client or shared cache may reuse for max_age seconds
+    Answers 304 Not Modified when the client's If-None-Match still matches
+    """
+    response = json_bytes_response(body)
+    response.set_etag(hashlib.blake2b(body, digest_size=16).hexdigest())
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    return response.make_conditional(request)
+
+def orjson_response(data, status=200):
+    """Serialize data with orjson and wrap it in a JSON response"""
+    return json_bytes_response(orjson_dumps(data), status)
+
+def orjson_stream_response(key, items, serialize, trailer=None, status=200):
+    """
+    Stream {key: [...]} one item at a time so the full list never sits in memory
+
+    The first item is fetched before the response is returned, so the query
+    runs (and its first yield_per batch loads) inside the route, where errors
+    still become a 500. A failure in a later batch can only cut the body
+    short, because the 200 status has already been sent.
+
+    Args:
+        key: Name of the list field
+        items: Iterable of rows, consumed lazily while the response is sent
+        serialize: Callable turning one row into a dict
+        trailer: Optional callable returning extra fields, evaluated after
+            the list has been written
+        status: HTTP status code
+    """
+    rows = iter(items)
+    first = next(rows, _NO_ROWS)
+
+    def generate():
+        yield b'{' + orjson.dumps(key) + b':['
+        if first is not _NO_ROWS:
+            yield orjson_dumps(serialize(first))
+            for item in rows:
+                yield b',' + orjson_dumps(serialize(item))
+        yield b']'
+        for name, value in (trailer() if trailer else {}).items():
+            yield b',' + orjson.dumps(name) + b':' + orjson_dumps(value)
+        yield b'}'
+
+    return current_app.response_class(
+        stream_with_context(generate()),
+        status=status,
+        mimetype='application/json'
+    )
+
+def _flask_default(o):
+    """Encode the types Flask's default provider handles that orjson does not"""
+    if isinstance(o, date):
+        return http_date(o)
+    if isinstance(o, (Decimal, uuid.UUID)):
+        return str(o)
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    raise TypeError(f'Object of type {type(o).__name__} is not JSON serializable')
+
+class ORJSONProvider(JSONProvider):
+    """
+    Flask JSON provider backed by orjson, used by jsonify and request.get_json
+
+    Dates, Decimals and UUIDs are encoded as Flask's default provider does;
+    keys are not sorted.
+    """
+    # Datetimes are passed to _flask_default so they keep Flask's HTTP-date format
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=_flask_default, option=self.options).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=_flask_default, option=self.options),
+            mimetype='application/json'
+        )
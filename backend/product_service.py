@@ -0,0 +1,62 @@
+"""
+Cached product cards shared by every customer's wishlist
+A card is a product with its baker's id, shop name and city. It is stored
+as serialized JSON so wishlists are assembled from the cached bytes
+"""
+from sqlalchemy.orm import joinedload
+from cache_service import cache_get_many, cache_set_many, cache_delete, invalidate_rows_on_commit
+from database import Product
+from orjson_response import orjson_dumps
+
+PRODUCT_CARD_TTL = 600
+
+def product_card_key(product_id):
+    """Cache key for a product's card"""
+    return f'product:card:{product_id}'
+
+def product_card(product):
+    """Serialize a product loaded with its baker"""
+    return {
+        'id': product.id,
+        'name': product.name,
+        'category': product.category,
+        'price': product.price,
+        'description': product.description,
+        'image_url': product.image_url,
+        'in_stock': product.in_stock,
+        'baker': {
+            'id': product.baker.id,
+            'shop_name': product.baker.shop_name,
+            'city': product.baker.city
+        }
+    }
+
+def get_product_cards(product_ids):
+    """
+    Return {product_id: card JSON bytes} for the products that still exist
+    Cards missing from the cache are loaded with their bakers in one query
+    """
+    product_ids = list(dict.fromkeys(product_ids))
+    cached = cache_get_many([product_card_key(product_id) for product_id in product_ids])
+    cards = {product_id: card for product_id, card in zip(product_ids, cached) if card}
+
+    missing = [product_id for product_id in product_ids if product_id not in cards]
+    if missing:
+        loaded = {
+            product.id: orjson_dumps(product_card(product))
+            for product in Product.query.options(joinedload(Product.baker)).filter(Product.id.in_(missing))
+        }
+        cache_set_many({product_card_key(product_id): card for product_id, card in loaded.items()}, PRODUCT_CARD_TTL)
+        cards.update(loaded)
+
+    return cards
+
+def forget_product_cards(*product_ids):
+    """Drop cached cards for products removed with bulk statements"""
+    if product_ids:
+        cache_delete(*map(product_card_key, product_ids))
+
+# Product edits and deletes made through the ORM drop the card on commit.
+# A baker's shop name and city are fixed after registration, so only a
+# baker removal (via forget_product_cards) affects their cards
+invalidate_rows_on_commit(Product, lambda product: [product_card_key(product.id)])
@@ -0,0 +1,41 @@
+"""
+Request payload schemas
+Validated in one pass by pydantic's compiled core
+"""
+from pydantic import BaseModel, ConfigDict, ValidationError
+
+class RequestSchema(BaseModel):
+    # Accept numbers where strings are expected (e.g. phone, zip_code)
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+
+class UserCreate(RequestSchema):
+    name: str
+    email: str
+    password: str
+
+class BakerCreate(RequestSchema):
+    email: str
+    password: str
+    shop_name: str
+    owner_name: str
+    phone: str
+    business_license: str
+    tax_id: str
+    shop_address: str
+    city: str
+    state: str
+    zip_code: str
+    shop_description: str
+    verified: bool = False
+
+def validation_message(error: ValidationError) -> str:
+    """Turn a ValidationError into a short client-facing message"""
+    missing = sorted(str(e['loc'][0]) for e in error.errors() if e['type'] == 'missing' and e['loc'])
+    if missing:
+        return f'Missing required fields: {", ".join(missing)}'
+
+    invalid = sorted(str(e['loc'][0]) for e in error.errors() if e['loc'])
+    if invalid:
+        return f'Invalid fields: {", ".join(invalid)}'
+
+    return 'Invalid request body'
@@ -0,0 +1,74 @@
+"""
+JWT issuing and verification shared by the API routes
+Recently verified tokens skip the signature check and payload decode
+"""
+import time
+import base64
+import hashlib
+import hmac
+import threading
+import jwt
+import orjson
+from cachetools import TTLCache
+
+# Decoded payloads keyed by SHA-256 of the secret and token, so raw tokens
+# are not kept in memory and a different secret never matches. Expiry is
+# still checked on every hit; failed verifications are never cached.
+TOKEN_CACHE_TTL = 300
+_payload_cache = TTLCache(maxsize=10000, ttl=TOKEN_CACHE_TTL)
+_payload_cache_lock = threading.Lock()
+
+_jwt = jwt.PyJWT()
+_JWT_ALGORITHMS = ['HS256']
+
+TOKEN_LIFETIME = 7 * 24 * 3600
+
+def _b64url(data: bytes) -> bytes:
+    """Unpadded URL-safe base64, as used in JWT segments"""
+    return base64.urlsafe_b64encode(data).rstrip(b'=')
+
+# The HS256 header never changes, so it is encoded once instead of per token
+_JWT_HEADER_B64 = _b64url(b'{"alg":"HS256","typ":"JWT"}')
+
+def encode_token(user_id, user_type: str, secret_key: str) -> str:
+    """
+    Issue an HS256 JWT for a user, valid for TOKEN_LIFETIME seconds
+    Produces the same token as jwt.encode with an exp claim
+    """
+    payload = orjson.dumps({
+        'user_id': user_id,
+        'user_type': user_type,
+        'exp': int(time.time()) + TOKEN_LIFETIME
+    })
+    signing_input = _JWT_HEADER_B64 + b'.' + _b64url(payload)
+    signature = hmac.new(secret_key.encode('utf-8'), signing_input, hashlib.sha256).digest()
+    return (signing_input + b'.' + _b64url(signature)).decode('ascii')
+
+def decode_token(token: str, secret_key: str):
+    """
+    Verify a JWT and return its payload
+
+    Returns:
+        dict payload (shared, do not modify) or None if invalid or expired
+    """
+    cache_key = hashlib.sha256(f'{secret_key}\0{token}'.encode('utf-8')).digest()
+
+    with _payload_cache_lock:
+        payload = _payload_cache.get(cache_key)
+
+    if payload is not None:
+        if payload.get('exp', float('inf')) > time.time():
+            return payload
+        with _payload_cache_lock:
+            _payload_cache.pop(cache_key, None)
+        return None
+
+    try:
+        payload = _jwt.decode(token, secret_key, algorithms=_JWT_ALGORITHMS)
+    except jwt.InvalidTokenError:
+        # Includes ExpiredSignatureError
+        return None
+
+    with _payload_cache_lock:
+        _payload_cache[cache_key] = payload
+    return payload